@@ -12,28 +12,75 @@ This analyzer implements the simplified database schema approach:
 import json
 import logging
 import os
+import re
 import uuid
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
-from datetime import datetime, date
+from datetime import datetime, timezone
 
 from dotenv import load_dotenv
 import google.generativeai as genai
-from lib.supabase_client import get_supabase_client, get_supabase_admin_client
+from lib.supabase_client import get_supabase_client, get_supabase_admin_client, is_missing_function_error
+from lib import json_utils
 
 load_dotenv()
 logger = logging.getLogger(__name__)
 
+# Article headers ("Artigo 1.º", "Artigo 2.o", ...) at the start of a line
+_ARTICLE_HEADER_RE = re.compile(r'(?m)^[ \t]*Artigo\s+(\d+)\.?\s*[ºo°]')
+
+# Characters that are not allowed in URL slugs
+_SLUG_INVALID_RE = re.compile(r'[^a-z0-9-]+')
+
+# Every V3.1 prompt expects a JSON answer: ask for it natively and keep output deterministic
+_JSON_GENERATION_CONFIG = {
+    "response_mime_type": "application/json",
+    "temperature": 0.1
+}
+
+# Process-wide Gemini model, shared by every analyzer instance
+_MODEL: Optional[genai.GenerativeModel] = None
+
+
+def _get_model() -> genai.GenerativeModel:
+    """Configure Gemini once and return the shared model instance."""
+    global _MODEL
+    if _MODEL is None:
+        genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
+        _MODEL = genai.GenerativeModel('gemini-2.0-flash', generation_config=_JSON_GENERATION_CONFIG)
+    return _MODEL
+
+
+def _parse_llm_json(text: str) -> Any:
+    """Parse the JSON object/array embedded in an LLM response (ignores ``` fences)."""
+    starts = [i for i in (text.find('{'), text.find('[')) if i != -1]
+    if not starts:
+        raise json.JSONDecodeError("No JSON object found in response", text, 0)
+    start = min(starts)
+    end = text.rfind('}' if text[start] == '{' else ']')
+    return json_utils.loads(text[start:end + 1])
+
+
 class KritisAnalyzerV31:
     """Kritis V3.1 - Refactored analyzer following PROD9 specifications."""
 
+    # Concurrent Gemini requests during Stage 2 (bounded by the API rate limit)
+    MAX_ANALYSIS_WORKERS = int(os.getenv('KRITIS_MAX_ANALYSIS_WORKERS', '8'))
+    
+    # Constant columns of every law_articles row
+    MANDATE_ID = "50259b5a-054e-4bbf-a39d-637e7d1c1f9f"  # Actual mandate ID
+    ACTIVE_STATUS_ID = "ACTIVE"
+    
+    # Ask Gemini to split the document when no article headers are found
+    LLM_SPLIT_FALLBACK = os.getenv('KRITIS_LLM_SPLIT_FALLBACK', 'true').lower() == 'true'
+
     def __init__(self):
         """Initialize Kritis V3.1 with Supabase clients and Gemini AI."""
         self.supabase = get_supabase_client()
         self.supabase_admin = get_supabase_admin_client()
-        genai.configure(api_key=os.getenv('GEMINI_API_KEY'))
         
-        # Initialize Gemini model
-        self.model = genai.GenerativeModel('gemini-2.0-flash')
+        # Reuse the process-wide Gemini model
+        self.model = _get_model()
         self.model_version = 'gemini-2.0-flash'
         
     # ========================================
@@ -57,16 +104,14 @@ class KritisAnalyzerV31:
         logger.info(f"🔄 Kritis V3.1 Stage 1: Enhanced Extractor for source {source_id}")
         
         # Get document chunks
-        chunks_response = self.supabase_admin.table('document_chunks').select('*').eq('source_id', source_id).order('chunk_index').execute()
+        chunks_response = self.supabase_admin.table('document_chunks').select('content').eq('source_id', source_id).order('chunk_index').execute()
         if not chunks_response.data:
             raise ValueError(f"No document chunks found for source {source_id}")
         
         chunks = chunks_response.data
         
         # Combine all chunk content
-        full_text = ""
-        for chunk in chunks:
-            full_text += chunk['content'] + "\n\n"
+        full_text = "\n\n".join(chunk['content'] for chunk in chunks)
         
         # Extract metadata from first chunk
         first_chunk_text = chunks[0]['content']
@@ -80,7 +125,7 @@ class KritisAnalyzerV31:
             "preamble_text": extraction_result["preamble_text"],
             "articles": extraction_result["articles"],
             "metadata": metadata,
-            "extraction_timestamp": datetime.utcnow().isoformat(),
+            "extraction_timestamp": datetime.now(timezone.utc).isoformat(),
             "total_articles": len(extraction_result["articles"]),
             "has_preamble": bool(extraction_result["preamble_text"].strip())
         }
@@ -89,16 +134,16 @@ class KritisAnalyzerV31:
         self.supabase_admin.table('pending_extractions').insert({
             'source_id': source_id,
             'status': 'COMPLETED',
-            'extracted_data': extracted_data,
-            'created_at': datetime.utcnow().isoformat()
-        }).execute()
+            'extracted_data': extracted_data
+        }).execute()  # created_at defaults to now() in the database
         
         logger.info(f"✅ Enhanced extraction completed: {len(extraction_result['articles'])} articles, preamble: {bool(extraction_result['preamble_text'].strip())}")
         
         return {
             'total_articles': len(extraction_result['articles']),
             'has_preamble': bool(extraction_result['preamble_text'].strip()),
-            'metadata': metadata
+            'metadata': metadata,
+            'extracted_data': extracted_data
         }
     
     def _extract_metadata(self, first_chunk_text: str) -> Dict[str, Any]:
@@ -122,15 +167,7 @@ class KritisAnalyzerV31:
         
         try:
             response = self.model.generate_content(metadata_prompt)
-            metadata_text = response.text.strip()
-            
-            # Clean the response to ensure it's valid JSON
-            if metadata_text.startswith('```json'):
-                metadata_text = metadata_text[7:]
-            if metadata_text.endswith('```'):
-                metadata_text = metadata_text[:-3]
-            
-            metadata = json.loads(metadata_text)
+            metadata = _parse_llm_json(response.text)
             
             # Ensure government_entity_id is set
             metadata['government_entity_id'] = "3ee8d3ef-7226-4bf3-8ea2-6e2e036d203f"
@@ -146,6 +183,36 @@ class KritisAnalyzerV31:
     def _extract_preamble_and_articles(self, full_text: str) -> Dict[str, Any]:
         """Extract preamble and articles according to PROD9 specifications."""
         
+        matches = list(_ARTICLE_HEADER_RE.finditer(full_text))
+        if matches:
+            # Deterministic split: everything before the first header is the preamble
+            articles = []
+            for i, match in enumerate(matches):
+                end = matches[i + 1].start() if i + 1 < len(matches) else len(full_text)
+                articles.append({
+                    "article_number": f"Artigo {match.group(1)}.º",
+                    "official_text": full_text[match.start():end].strip()
+                })
+            
+            logger.info(f"🔍 Split {len(articles)} articles using article header pattern")
+            return {
+                "preamble_text": full_text[:matches[0].start()].strip(),
+                "articles": articles
+            }
+        
+        if not self.LLM_SPLIT_FALLBACK:
+            logger.warning("⚠️ No article headers found and LLM fallback disabled")
+            return {
+                "preamble_text": full_text.strip(),
+                "articles": []
+            }
+        
+        logger.info("🤖 No article headers found, falling back to Gemini extraction")
+        return self._extract_preamble_and_articles_with_llm(full_text)
+    
+    def _extract_preamble_and_articles_with_llm(self, full_text: str) -> Dict[str, Any]:
+        """Ask Gemini to separate preamble and articles (fallback for unusual layouts)."""
+        
         extraction_prompt = f"""
         You are a Portuguese legal document parser. Your task is to separate the preamble from the numbered articles in this legal document.
 
@@ -182,22 +249,10 @@ class KritisAnalyzerV31:
         
         try:
             response = self.model.generate_content(extraction_prompt)
-            extraction_text = response.text.strip()
-            
-            # Clean the response to ensure it's valid JSON
-            if extraction_text.startswith('```json'):
-                extraction_text = extraction_text[7:]
-            if extraction_text.endswith('```'):
-                extraction_text = extraction_text[:-3]
-            
-            # Additional cleaning - remove any markdown formatting
-            import re
-            extraction_text = re.sub(r'^```.*?\n', '', extraction_text, flags=re.MULTILINE)
-            extraction_text = re.sub(r'\n```$', '', extraction_text)
-            extraction_text = extraction_text.strip()
+            extraction_text = response.text
             
             logger.info(f"🔍 Attempting to parse extraction JSON (length: {len(extraction_text)} chars)")
-            result = json.loads(extraction_text)
+            result = _parse_llm_json(extraction_text)
             
             # Validate the structure
             if 'preamble_text' not in result:
@@ -227,7 +282,7 @@ class KritisAnalyzerV31:
     # STAGE 2: ENHANCED KRITIS ANALYST
     # ========================================
     
-    def run_enhanced_analyst_phase(self, source_id: str) -> Dict[str, Any]:
+    def run_enhanced_analyst_phase(self, source_id: str, extracted_data: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
         """
         Stage 2: Analyze each article and preamble with structured output.
         
@@ -238,6 +293,7 @@ class KritisAnalyzerV31:
         
         Args:
             source_id: UUID of the source document
+            extracted_data: Stage 1 output when already in memory (skips the Supabase read)
             
         Returns:
             Dict containing analysis results
@@ -245,60 +301,48 @@ class KritisAnalyzerV31:
         logger.info(f"🧠 Kritis V3.1 Stage 2: Enhanced Analyst for source {source_id}")
         
         # Get extraction data
-        extraction_response = self.supabase_admin.table('pending_extractions').select('*').eq('source_id', source_id).order('created_at', desc=True).limit(1).execute()
-        if not extraction_response.data:
-            raise ValueError(f"No extraction data found for source {source_id}")
-        
-        extraction_data = extraction_response.data[0]['extracted_data']
-        
-        analysis_results = []
-        total_items = 0
-        successful_analyses = 0
+        if extracted_data is not None:
+            extraction_data = extracted_data
+        else:
+            extraction_response = self.supabase_admin.table('pending_extractions').select('extracted_data').eq('source_id', source_id).order('created_at', desc=True).limit(1).execute()
+            if not extraction_response.data:
+                raise ValueError(f"No extraction data found for source {source_id}")
+            
+            extraction_data = extraction_response.data[0]['extracted_data']
         
-        # Analyze preamble if it exists
+        # Build the work list: preamble (order 0) followed by articles (order 1..N)
+        work_items = []
         if extraction_data.get('preamble_text', '').strip():
-            logger.info("🔍 Analyzing preamble...")
-            try:
-                preamble_analysis = self._analyze_content(
-                    content=extraction_data['preamble_text'],
-                    content_type="preamble"
-                )
-                analysis_results.append({
-                    'content_type': 'preamble',
-                    'article_order': 0,
-                    'analysis': preamble_analysis
-                })
-                successful_analyses += 1
-            except Exception as e:
-                logger.error(f"❌ Preamble analysis failed: {e}")
-            total_items += 1
+            work_items.append({
+                'content_type': 'preamble',
+                'article_order': 0,
+                'content': extraction_data['preamble_text']
+            })
         
-        # Analyze each article
         articles = extraction_data.get('articles', [])
         for i, article in enumerate(articles):
-            logger.info(f"🔍 Analyzing {article.get('article_number', f'Article {i+1}')}...")
-            try:
-                article_analysis = self._analyze_content(
-                    content=article['official_text'],
-                    content_type="article",
-                    article_number=article.get('article_number', f"Artigo {i+1}.º")
-                )
-                analysis_results.append({
-                    'content_type': 'article',
-                    'article_order': i + 1,
-                    'article_number': article.get('article_number'),
-                    'analysis': article_analysis
-                })
-                successful_analyses += 1
-            except Exception as e:
-                logger.error(f"❌ Article {i+1} analysis failed: {e}")
-            total_items += 1
+            work_items.append({
+                'content_type': 'article',
+                'article_order': i + 1,
+                'article_number': article.get('article_number'),
+                'content': article.get('official_text', '')
+            })
+        
+        total_items = len(work_items)
+        
+        # Each Gemini call is I/O-bound, so dispatch them concurrently and
+        # reassemble the results in document order afterwards
+        with ThreadPoolExecutor(max_workers=self.MAX_ANALYSIS_WORKERS) as executor:
+            outcomes = list(executor.map(self._analyze_work_item, work_items))
+        
+        analysis_results = [outcome for outcome in outcomes if outcome is not None]
+        successful_analyses = len(analysis_results)
         
         # Store analysis results
         analysis_data = {
             'source_id': source_id,
             'analysis_results': analysis_results,
-            'analysis_timestamp': datetime.utcnow().isoformat(),
+            'analysis_timestamp': datetime.now(timezone.utc).isoformat(),
             'total_items_analyzed': total_items,
             'successful_analyses': successful_analyses,
             'completion_rate': (successful_analyses / total_items * 100) if total_items > 0 else 0
@@ -308,18 +352,55 @@ class KritisAnalyzerV31:
         self.supabase_admin.table('source_ai_analysis').insert({
             'source_id': source_id,
             'model_version': 'kritis_v31_enhanced_analyst',
-            'analysis_data': analysis_data,
-            'created_at': datetime.utcnow().isoformat()
-        }).execute()
+            'analysis_data': analysis_data
+        }).execute()  # created_at defaults to now() in the database
         
         logger.info(f"✅ Enhanced analysis completed: {successful_analyses}/{total_items} items analyzed successfully")
         
         return {
             'total_items_analyzed': total_items,
             'successful_analyses': successful_analyses,
-            'completion_rate': (successful_analyses / total_items * 100) if total_items > 0 else 0
+            'completion_rate': (successful_analyses / total_items * 100) if total_items > 0 else 0,
+            'analysis_data': analysis_data
         }
     
+    def _analyze_work_item(self, item: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Analyze a single preamble/article work item, returning None on failure."""
+        
+        if item['content_type'] == 'preamble':
+            logger.info("🔍 Analyzing preamble...")
+            try:
+                preamble_analysis = self._analyze_content(
+                    content=item['content'],
+                    content_type="preamble"
+                )
+                return {
+                    'content_type': 'preamble',
+                    'article_order': 0,
+                    'analysis': preamble_analysis
+                }
+            except Exception as e:
+                logger.error(f"❌ Preamble analysis failed: {e}")
+                return None
+        
+        order = item['article_order']
+        logger.info(f"🔍 Analyzing {item.get('article_number') or f'Article {order}'}...")
+        try:
+            article_analysis = self._analyze_content(
+                content=item['content'],
+                content_type="article",
+                article_number=item.get('article_number') or f"Artigo {order}.º"
+            )
+            return {
+                'content_type': 'article',
+                'article_order': order,
+                'article_number': item.get('article_number'),
+                'analysis': article_analysis
+            }
+        except Exception as e:
+            logger.error(f"❌ Article {order} analysis failed: {e}")
+            return None
+    
     def _analyze_content(self, content: str, content_type: str, article_number: Optional[str] = None) -> Dict[str, Any]:
         """Analyze content (preamble or article) with enhanced structured output."""
         
@@ -404,15 +485,7 @@ class KritisAnalyzerV31:
         
         try:
             response = self.model.generate_content(analysis_prompt)
-            analysis_text = response.text.strip()
-            
-            # Clean the response to ensure it's valid JSON
-            if analysis_text.startswith('```json'):
-                analysis_text = analysis_text[7:]
-            if analysis_text.endswith('```'):
-                analysis_text = analysis_text[:-3]
-            
-            analysis = json.loads(analysis_text)
+            analysis = _parse_llm_json(response.text)
             return analysis
             
         except Exception as e:
@@ -439,7 +512,8 @@ class KritisAnalyzerV31:
     # STAGE 3: ENHANCED LAW INGESTION
     # ========================================
     
-    def run_enhanced_law_ingestion(self, source_id: str) -> str:
+    def run_enhanced_law_ingestion(self, source_id: str, extracted_data: Optional[Dict[str, Any]] = None,
+                                   analysis_data: Optional[Dict[str, Any]] = None) -> str:
         """
         Stage 3: Create law records following PROD9 simplified schema.
         
@@ -451,47 +525,45 @@ class KritisAnalyzerV31:
         
         Args:
             source_id: UUID of the source document
+            extracted_data: Stage 1 output when already in memory (skips the Supabase read)
+            analysis_data: Stage 2 output when already in memory (skips the Supabase read)
             
         Returns:
             str: UUID of the created law
         """
         logger.info(f"📚 Kritis V3.1 Stage 3: Enhanced Law Ingestion for source {source_id}")
         
-        # Get extraction and analysis data
-        extraction_response = self.supabase_admin.table('pending_extractions').select('*').eq('source_id', source_id).order('created_at', desc=True).limit(1).execute()
-        if not extraction_response.data:
-            raise ValueError(f"No extraction data found for source {source_id}")
-        
-        analysis_response = self.supabase_admin.table('source_ai_analysis').select('*').eq('source_id', source_id).eq('model_version', 'kritis_v31_enhanced_analyst').order('created_at', desc=True).limit(1).execute()
-        if not analysis_response.data:
-            raise ValueError(f"No analysis data found for source {source_id}")
-        
-        extraction_data = extraction_response.data[0]['extracted_data']
-        analysis_data = analysis_response.data[0]['analysis_data']
+        # Analysis data is always needed for the law summary synthesis
+        if analysis_data is None:
+            analysis_response = self.supabase_admin.table('source_ai_analysis').select('analysis_data').eq('source_id', source_id).eq('model_version', 'kritis_v31_enhanced_analyst').order('created_at', desc=True).limit(1).execute()
+            if not analysis_response.data:
+                raise ValueError(f"No analysis data found for source {source_id}")
+            
+            analysis_data = analysis_response.data[0]['analysis_data']
         
         # Start transaction-based ingestion
         try:
-            # Step 1: Create parent law record
-            law_id = self._create_parent_law_record(source_id, extraction_data)
-            logger.info(f"✅ Created parent law record: {law_id}")
-            
-            # Step 2: Process and insert preamble (if exists)
-            preamble_version_id = None
-            if extraction_data.get('preamble_text', '').strip():
-                preamble_version_id = self._insert_preamble_version(law_id, extraction_data, analysis_data)
-                logger.info(f"✅ Created preamble version: {preamble_version_id}")
-            
-            # Step 3: Process and insert articles
-            article_version_ids = self._insert_article_versions(law_id, extraction_data, analysis_data)
-            logger.info(f"✅ Created {len(article_version_ids)} article versions")
+            # Steps 1-4 in one server-side transaction (falls back to client-side steps)
+            law_id = self._ingest_law_via_rpc(source_id)
+            if law_id:
+                logger.info(f"✅ Created law, article versions and aggregated tags via RPC: {law_id}")
+                law_update: Dict[str, Any] = {}
+            else:
+                law_id = self._ingest_law_client_side(source_id, analysis_data, extracted_data)
+                
+                # Step 4: Aggregate tags for the parent law
+                law_update = {'tags': self._aggregate_tags(analysis_data)}
+                logger.info("✅ Aggregated tags for parent law")
             
-            # Step 4: Aggregate tags and update parent law
-            self._aggregate_tags_and_update_law(law_id)
-            logger.info("✅ Aggregated tags and updated parent law")
+            # Step 5: Generate law summary
+            synthesis = self._synthesize_law_summary(analysis_data)
+            if synthesis is not None:
+                law_update['translations'] = synthesis
+                logger.info("✅ Generated law summary")
             
-            # Step 5: Generate and store law summary
-            self._generate_and_store_law_summary(law_id, analysis_data)
-            logger.info("✅ Generated and stored law summary")
+            # Store tags and summary on the parent law with a single UPDATE
+            if law_update:
+                self.supabase_admin.table('laws').update(law_update).eq('id', law_id).execute()
             
             logger.info(f"🎯 Enhanced law ingestion completed successfully: {law_id}")
             return law_id
@@ -500,6 +572,87 @@ class KritisAnalyzerV31:
             logger.error(f"❌ Enhanced law ingestion failed: {e}")
             raise
     
+    def run_complete_v31_pipeline(self, source_id: str) -> str:
+        """
+        Run all Kritis V3.1 stages, passing each stage's output to the next in memory.
+        
+        Intermediate results are still persisted by each stage; only the
+        read-backs between stages are skipped.
+        
+        Args:
+            source_id: UUID of the source document
+            
+        Returns:
+            str: UUID of the created law
+        """
+        logger.info(f"🚀 Starting Complete Kritis V3.1 Pipeline for source {source_id}")
+        
+        extract_result = self.run_enhanced_extractor_phase(source_id)
+        logger.info(f"✅ Stage 1 complete: {extract_result['total_articles']} articles, preamble: {extract_result['has_preamble']}")
+        
+        analyze_result = self.run_enhanced_analyst_phase(source_id, extracted_data=extract_result['extracted_data'])
+        logger.info(f"✅ Stage 2 complete: {analyze_result['successful_analyses']}/{analyze_result['total_items_analyzed']} items analyzed")
+        
+        law_id = self.run_enhanced_law_ingestion(
+            source_id,
+            extracted_data=extract_result['extracted_data'],
+            analysis_data=analyze_result['analysis_data']
+        )
+        logger.info(f"🎉 Complete Kritis V3.1 Pipeline finished successfully: {law_id}")
+        return law_id
+    
+    def _ingest_law_via_rpc(self, source_id: str) -> Optional[str]:
+        """Run the agora.ingest_law stored procedure; returns None if it is not deployed."""
+        
+        try:
+            response = self.supabase_admin.rpc('ingest_law', {
+                'p_source_id': source_id,
+                'p_mandate_id': self.MANDATE_ID,
+                'p_model_version': 'kritis_v31_enhanced_analyst'
+            }).execute()
+            return response.data or None
+        except Exception as e:
+            # Any other error (constraint violation, timeout after a possible commit) must not be retried client-side
+            if not is_missing_function_error(e):
+                raise
+            logger.warning(f"⚠️ ingest_law RPC unavailable, using client-side ingestion: {e}")
+            return None
+    
+    def _ingest_law_client_side(self, source_id: str, analysis_data: Dict[str, Any],
+                                extracted_data: Optional[Dict[str, Any]] = None) -> str:
+        """Fallback ingestion path issuing the individual Supabase requests."""
+        
+        if extracted_data is not None:
+            extraction_data = extracted_data
+        else:
+            extraction_response = self.supabase_admin.table('pending_extractions').select('extracted_data').eq('source_id', source_id).order('created_at', desc=True).limit(1).execute()
+            if not extraction_response.data:
+                raise ValueError(f"No extraction data found for source {source_id}")
+            
+            extraction_data = extraction_response.data[0]['extracted_data']
+        
+        # Index the analyses once by (content_type, article_order) for both insert helpers
+        analyses_by_key = {
+            (result['content_type'], result.get('article_order', 0)): result['analysis']
+            for result in analysis_data.get('analysis_results', [])
+        }
+        
+        # Step 1: Create parent law record
+        law_id = self._create_parent_law_record(source_id, extraction_data)
+        logger.info(f"✅ Created parent law record: {law_id}")
+        
+        # Step 2: Process and insert preamble (if exists)
+        preamble_version_id = None
+        if extraction_data.get('preamble_text', '').strip():
+            preamble_version_id = self._insert_preamble_version(law_id, extraction_data, analyses_by_key)
+            logger.info(f"✅ Created preamble version: {preamble_version_id}")
+        
+        # Step 3: Process and insert articles
+        article_version_ids = self._insert_article_versions(law_id, extraction_data, analyses_by_key)
+        logger.info(f"✅ Created {len(article_version_ids)} article versions")
+        
+        return law_id
+    
     def _create_parent_law_record(self, source_id: str, extraction_data: Dict[str, Any]) -> str:
         """Create the parent law record according to PROD9 specifications."""
         
@@ -514,8 +667,7 @@ class KritisAnalyzerV31:
             slug = f"law-{uuid.uuid4().hex[:8]}"
         
         # Clean slug to be URL-safe
-        import re
-        slug = re.sub(r'[^a-z0-9\-]', '', slug)
+        slug = _SLUG_INVALID_RE.sub('', slug)
         
         law_data = {
             'id': str(uuid.uuid4()),
@@ -526,111 +678,108 @@ class KritisAnalyzerV31:
             'official_number': metadata.get('official_number'),
             'type_id': metadata.get('law_type_id'),
             'enactment_date': metadata.get('enactment_date'),
-            'tags': None,  # Will be populated in aggregation step
-            'translations': None  # Will be populated in summary step
+            'tags': None,  # Populated together with translations after ingestion
+            'translations': None  # Populated from the law summary synthesis
         }
         
         response = self.supabase_admin.table('laws').insert(law_data).execute()
         return law_data['id']
     
-    def _insert_preamble_version(self, law_id: str, extraction_data: Dict[str, Any], analysis_data: Dict[str, Any]) -> str:
+    def _insert_preamble_version(self, law_id: str, extraction_data: Dict[str, Any], analyses_by_key: Dict[tuple, Dict[str, Any]]) -> str:
         """Insert preamble as article_order = 0."""
         
         preamble_text = extraction_data['preamble_text']
-        
-        # Find preamble analysis
-        preamble_analysis = None
-        for result in analysis_data['analysis_results']:
-            if result['content_type'] == 'preamble':
-                preamble_analysis = result['analysis']
-                break
+        preamble_analysis = analyses_by_key.get(('preamble', 0))
         
         version_data = {
             'id': str(uuid.uuid4()),
             'law_id': law_id,
             'article_order': 0,  # Explicit identifier for preamble
-            'mandate_id': "50259b5a-054e-4bbf-a39d-637e7d1c1f9f",  # Actual mandate ID
-            'status_id': "ACTIVE",
-            'valid_from': datetime.utcnow().date().isoformat(),
+            'mandate_id': self.MANDATE_ID,
+            'status_id': self.ACTIVE_STATUS_ID,
+            'valid_from': datetime.now(timezone.utc).date().isoformat(),
             'official_text': preamble_text,
             'tags': preamble_analysis.get('tags', []) if preamble_analysis else [],
             'translations': preamble_analysis.get('analysis', {}) if preamble_analysis else {}
         }
         
-        response = self.supabase_admin.table('law_article_versions').insert(version_data).execute()
+        response = self.supabase_admin.table('law_articles').insert(version_data).execute()
         return version_data['id']
     
-    def _insert_article_versions(self, law_id: str, extraction_data: Dict[str, Any], analysis_data: Dict[str, Any]) -> List[str]:
-        """Insert all articles as law_article_versions."""
+    def _insert_article_versions(self, law_id: str, extraction_data: Dict[str, Any], analyses_by_key: Dict[tuple, Dict[str, Any]]) -> List[str]:
+        """Insert all articles as law_articles rows."""
         
         articles = extraction_data.get('articles', [])
-        analysis_results = analysis_data.get('analysis_results', [])
-        
-        # Create mapping of article analyses
-        article_analyses = {}
-        for result in analysis_results:
-            if result['content_type'] == 'article':
-                article_analyses[result['article_order']] = result['analysis']
         
-        version_ids = []
+        rows: List[Dict[str, Any]] = []
+        valid_from = datetime.now(timezone.utc).date().isoformat()
         
         for i, article in enumerate(articles):
             article_order = i + 1  # So "Artigo 1.º" is order 1, "Artigo 2.º" is order 2, etc.
-            analysis = article_analyses.get(article_order, {})
+            analysis = analyses_by_key.get(('article', article_order), {})
             
-            version_data = {
+            rows.append({
                 'id': str(uuid.uuid4()),
                 'law_id': law_id,
                 'article_order': article_order,
-                'mandate_id': "50259b5a-054e-4bbf-a39d-637e7d1c1f9f",  # Actual mandate ID
-                'status_id': "ACTIVE",
-                'valid_from': datetime.utcnow().date().isoformat(),
+                'mandate_id': self.MANDATE_ID,
+                'status_id': self.ACTIVE_STATUS_ID,
+                'valid_from': valid_from,
                 'official_text': article['official_text'],
                 'tags': analysis.get('tags', []),
                 'translations': analysis.get('analysis', {})
-            }
-            
-            response = self.supabase_admin.table('law_article_versions').insert(version_data).execute()
-            version_ids.append(version_data['id'])
+            })
         
-        return version_ids
+        # Single array insert instead of one round trip per article
+        if rows:
+            self.supabase_admin.table('law_articles').insert(rows).execute()
+        
+        return [row['id'] for row in rows]
     
-    def _aggregate_tags_and_update_law(self, law_id: str) -> None:
-        """Aggregate all tags from law_article_versions and update parent law."""
-        
-        # Get all tags from this law's article versions
-        versions_response = self.supabase_admin.table('law_article_versions').select('tags').eq('law_id', law_id).execute()
-        
-        all_tags = []
-        unique_tags = set()
-        
-        for version in versions_response.data:
-            if version.get('tags'):
-                for tag in version['tags']:
-                    tag_key = f"{tag.get('type', '')}:{tag.get('name', '')}"
-                    if tag_key not in unique_tags:
-                        unique_tags.add(tag_key)
-                        all_tags.append(tag)
-        
-        # Update the parent law with aggregated tags
-        self.supabase_admin.table('laws').update({
-            'tags': all_tags
-        }).eq('id', law_id).execute()
+    def _aggregate_tags(self, analysis_data: Dict[str, Any]) -> List[Dict[str, Any]]:
+        """Aggregate the unique tags of all analysis results for the parent law."""
+        
+        # The version rows were just written from this same analysis data,
+        # so aggregate here instead of reading them back from Supabase
+        unique_tags: Dict[tuple, Dict[str, Any]] = {}
+        
+        for result in analysis_data.get('analysis_results', []):
+            for tag in result.get('analysis', {}).get('tags', []) or []:
+                tag_key = (tag.get('type', ''), tag.get('name', ''))
+                if tag_key not in unique_tags:
+                    unique_tags[tag_key] = tag
+        
+        return list(unique_tags.values())
     
-    def _generate_and_store_law_summary(self, law_id: str, analysis_data: Dict[str, Any]) -> None:
-        """Generate high-level law summary and store in translations field."""
+    def _synthesize_law_summary(self, analysis_data: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Generate the high-level law summary for the translations field (None if nothing to summarize)."""
         
         # Collect all individual summaries
         summaries_pt = []
         summaries_en = []
+        summarized_analyses = []
         
         for result in analysis_data['analysis_results']:
-            analysis = result.get('analysis', {})
+            # The pt/en blocks live under the nested 'analysis' key of each result
+            content_analysis = result.get('analysis', {})
+            analysis = content_analysis.get('analysis', content_analysis)
             if analysis.get('pt', {}).get('informal_summary'):
                 summaries_pt.append(analysis['pt']['informal_summary'])
+                summarized_analyses.append(analysis)
             if analysis.get('en', {}).get('informal_summary'):
                 summaries_en.append(analysis['en']['informal_summary'])
         
+        # A single summary already is the law summary - no synthesis call needed
+        if len(summaries_pt) == 1:
+            only = summarized_analyses[0]
+            return {
+                lang: {
+                    "informal_summary_title": only.get(lang, {}).get('informal_summary_title', ''),
+                    "informal_summary": only.get(lang, {}).get('informal_summary', '')
+                }
+                for lang in ('pt', 'en')
+            }
+        
         # Generate synthesized summary
         if summaries_pt:
             combined_summary_pt = "\n\n".join(summaries_pt)
@@ -662,25 +811,12 @@ class KritisAnalyzerV31:
             
             try:
                 response = self.model.generate_content(synthesis_prompt)
-                synthesis_text = response.text.strip()
-                
-                # Clean the response
-                if synthesis_text.startswith('```json'):
-                    synthesis_text = synthesis_text[7:]
-                if synthesis_text.endswith('```'):
-                    synthesis_text = synthesis_text[:-3]
-                
-                synthesis = json.loads(synthesis_text)
-                
-                # Update the law with synthesized summary
-                self.supabase_admin.table('laws').update({
-                    'translations': synthesis
-                }).eq('id', law_id).execute()
+                return _parse_llm_json(response.text)
                 
             except Exception as e:
                 logger.warning(f"⚠️ Law summary synthesis failed: {e}")
                 # Use fallback summary
-                fallback_summary = {
+                return {
                     "pt": {
                         "informal_summary_title": "Lei analisada",
                         "informal_summary": "Esta lei foi processada pelo sistema Kritis."
@@ -690,7 +826,5 @@ class KritisAnalyzerV31:
                         "informal_summary": "This law was processed by the Kritis system."
                     }
                 }
-                
-                self.supabase_admin.table('laws').update({
-                    'translations': fallback_summary
-                }).eq('id', law_id).execute()
\ No newline at end of file
+        
+        return None
@@ -4,24 +4,267 @@ Implementing PROD5.md specifications for preamble handling, enriched analysis,
 and intelligent entity-driven tagging system.
 """
 
+import copy
+import hashlib
 import json
 import logging
 import os
 import re
+import tempfile
+import threading
 import time
-from datetime import datetime
-from typing import Dict, List, Optional, Tuple
+import uuid
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date, datetime
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
 import tiktoken
 
 from dotenv import load_dotenv
 import google.generativeai as genai
-from lib.supabase_client import get_supabase_admin_client
+from lib import json_utils
+from lib.gemini_retry import RATE_LIMIT_GEMINI_ERRORS, TRANSIENT_GEMINI_ERRORS, generate_content_with_retry
+from lib.llm_cache import LLMResponseCache
+from lib.supabase_client import get_supabase_admin_client, is_missing_function_error
 
 # Load environment variables
 load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+# Article detection patterns for chunk-based parsing
+_ARTICLE_HEAD_RE = re.compile(r'^\s*(?:artigo|art\.)\s+\d+', re.IGNORECASE)
+_ARTICLE_NUM_RE = re.compile(r'(?:artigo|art\.)\s+(\d+)', re.IGNORECASE)
+
+# Article headers at the start of a line ("Artigo 1.º", "ARTIGO 2.º", "Art. 3.º")
+_ARTICLE_SPLIT_RE = re.compile(r'(?m)^[ \t]*(?:Artigo|ARTIGO|Art\.|ART\.)\s+(\d+)\.?\s*[ºo°]')
+
+# Law type IDs returned by the metadata extractor, normalized to database values
+_LAW_TYPE_MAPPING = {
+    "DECRETO_PRESIDENTE_REPUBLICA": "DECRETO_PR",
+    "DECRETO_LEI": "DECRETO_LEI",
+    "LEI": "LEI",
+    "RESOLUCAO": "RESOLUCAO",
+    "PORTARIA": "PORTARIA",
+    "DESPACHO": "DESPACHO",
+    "CONSTITUTION": "CONSTITUTION"
+}
+
+# Valid agora.law_types IDs; anything else falls back to DECRETO_LEI
+_VALID_LAW_TYPES = frozenset({
+    'CONSTITUTION', 'CONSTITUTIONAL_REVISION', 'PARLIAMENTARY_LAW', 'DECREE_LAW', 'REGULATION',
+    'RESOLUTION', 'INTERNATIONAL_TREATY', 'ACORDAO', 'ACORDAO_STA', 'ACORDAO_STJ', 'ACORDAO_TC',
+    'ACORDAO_T_CONTAS', 'ACORDAO_DOUTRINARIO', 'ACORDO', 'ADITAMENTO', 'ALTERACAO', 'ALVARA',
+    'ANUNCIO', 'ASSENTO', 'AVISO', 'AVISO_BP', 'CARTA_CONSTITUCIONAL', 'CARTA_ADESAO',
+    'CARTA_RATIFICACAO', 'CIRCULAR', 'COMUNICACAO', 'CONTRATO', 'CONVENCAO', 'DECISAO',
+    'DECLARACAO', 'DECLARACAO_RETIFICACAO', 'DECRETO', 'DECRETO_APROVACAO_CONSTITUICAO',
+    'DECRETO_GOVERNO', 'DECRETO_PR', 'DECRETO_LEGISLATIVO_REGIONAL', 'DECRETO_REGIONAL',
+    'DECRETO_REGULAMENTAR', 'DECRETO_REGULAMENTAR_REGIONAL', 'DECRETO_LEI', 'DELIBERACAO',
+    'DESPACHO', 'DESPACHO_CONJUNTO', 'DESPACHO_NORMATIVO', 'EDITAL', 'ERRATA', 'INSTRUCAO',
+    'JURISPRUDENCIA', 'LEI', 'LEI_CONSTITUCIONAL', 'LEI_ORGANICA', 'LISTA', 'MAPA', 'MAPA_OFICIAL',
+    'MOCAO', 'MOCAO_CENSURA', 'MOCAO_CONFIANCA', 'PARECER', 'PORTARIA', 'PROGRAMA', 'PROTOCOLO',
+    'REGIMENTO', 'REGULAMENTO', 'RESOLUCAO', 'RESOLUCAO_AR', 'RESOLUCAO_CM', 'TRATADO'
+})
+
+# "Decreto-Lei n.º 30/2017, de 22 de março" style source titles
+_DECRETO_LEI_TITLE_RE = re.compile(
+    r'^\s*Decreto-Lei\s+n\.?\s*[º°o]?\s*(\d+(?:-[A-Z])?)/(\d{4}),?\s+de\s+(\d{1,2})\s+de\s+'
+    r'(janeiro|fevereiro|março|abril|maio|junho|julho|agosto|setembro|outubro|novembro|dezembro)'
+    r'(?:\s+de\s+(\d{4}))?',
+    re.IGNORECASE
+)
+_PT_MONTHS = {
+    'janeiro': 1, 'fevereiro': 2, 'março': 3, 'abril': 4,
+    'maio': 5, 'junho': 6, 'julho': 7, 'agosto': 8,
+    'setembro': 9, 'outubro': 10, 'novembro': 11, 'dezembro': 12
+}
+
+# Slug and article number normalization
+_SLUG_INVALID_RE = re.compile(r'[^a-zA-Z0-9]')
+_DASH_RUN_RE = re.compile(r'-+')
+_NON_DIGIT_RE = re.compile(r'[^\d]')
+_ISO_DATE_RE = re.compile(r'\d{4}-\d{2}-\d{2}')
+
+# Placeholder titles of analyses that failed ("Artigo não processado" / "Article not processed")
+_UNPROCESSED_TITLE_RE = re.compile(r'n[aã]o processado|not processed', re.IGNORECASE)
+
+# Revocation wording ("revoga", "revogado", "ab-rogação") that makes a cross-reference REVOKES
+_REVOKE_RE = re.compile(r'revog|ab[- ]?rog', re.IGNORECASE)
+
+# Process-level LRU+TTL cache of validated batch analyses, keyed by prompt input hash
+_BATCH_ANALYSIS_CACHE_SIZE = int(os.getenv('KRITIS_BATCH_CACHE_SIZE', '512'))
+_BATCH_ANALYSIS_CACHE_TTL_SECONDS = int(os.getenv('KRITIS_BATCH_CACHE_TTL_SECONDS', '3600'))
+_batch_analysis_cache: "OrderedDict[str, Tuple[float, List[Dict]]]" = OrderedDict()
+_batch_analysis_cache_lock = threading.Lock()
+
+
+def _get_cached_batch_analyses(key: str) -> Optional[List[Dict]]:
+    """Return a copy of the cached analyses for key, or None if missing/expired."""
+    with _batch_analysis_cache_lock:
+        entry = _batch_analysis_cache.get(key)
+        if entry is None:
+            return None
+        stored_at, analyses = entry
+        if time.monotonic() - stored_at > _BATCH_ANALYSIS_CACHE_TTL_SECONDS:
+            del _batch_analysis_cache[key]
+            return None
+        _batch_analysis_cache.move_to_end(key)
+    return copy.deepcopy(analyses)
+
+
+def _cache_batch_analyses(key: str, analyses: List[Dict]):
+    """Store a copy of analyses under key, evicting the least recently used entry when full."""
+    entry = (time.monotonic(), copy.deepcopy(analyses))
+    with _batch_analysis_cache_lock:
+        _batch_analysis_cache[key] = entry
+        _batch_analysis_cache.move_to_end(key)
+        while len(_batch_analysis_cache) > _BATCH_ANALYSIS_CACHE_SIZE:
+            _batch_analysis_cache.popitem(last=False)
+
+# Process-level cache of validated Gemini responses, keyed by prompt hash (enabled by KRITIS_USE_LLM_CACHE;
+# KRITIS_LLM_CACHE_DIR persists it across runs)
+_gemini_response_cache = LLMResponseCache(
+    max_entries=int(os.getenv('KRITIS_LLM_CACHE_SIZE', '256')),
+    ttl_seconds=int(os.getenv('KRITIS_LLM_CACHE_TTL_SECONDS', '86400')),
+    directory=os.getenv('KRITIS_LLM_CACHE_DIR') or None
+)
+
+
+class _CircuitBreaker:
+    """
+    Opens after `failure_threshold` transient failures within `window_seconds`, rejecting
+    calls for `cooldown_seconds`; then lets a single trial call through (half-open) and keeps
+    rejecting the others until that trial records its outcome.
+    """
+    
+    def __init__(self, failure_threshold: int, window_seconds: float, cooldown_seconds: float):
+        self.failure_threshold = failure_threshold
+        self.window_seconds = window_seconds
+        self.cooldown_seconds = cooldown_seconds
+        self._failures = deque()
+        self._opened_at = None
+        self._half_open = False
+        self._lock = threading.Lock()
+    
+    def allow(self) -> bool:
+        """Return whether a call may proceed; the call must then record its success or failure."""
+        with self._lock:
+            if self._opened_at is None:
+                return not self._half_open
+            if time.monotonic() - self._opened_at >= self.cooldown_seconds:
+                self._opened_at = None
+                self._half_open = True
+                return True
+            return False
+    
+    def is_open(self) -> bool:
+        """Return whether calls are currently rejected, without claiming the half-open trial."""
+        with self._lock:
+            if self._half_open:
+                return True
+            return self._opened_at is not None and time.monotonic() - self._opened_at < self.cooldown_seconds
+    
+    def record_success(self):
+        with self._lock:
+            self._failures.clear()
+            self._half_open = False
+    
+    def record_failure(self):
+        with self._lock:
+            now = time.monotonic()
+            self._failures.append(now)
+            while self._failures and now - self._failures[0] > self.window_seconds:
+                self._failures.popleft()
+            if self._half_open or len(self._failures) >= self.failure_threshold:
+                self._opened_at = now
+                self._failures.clear()
+                self._half_open = False
+
+# Law-level reduce prompts, rendered with str.format (literal braces are doubled)
+_LAW_SUMMARY_PROMPT_TMPL = """You are a legal expert tasked with creating a comprehensive law-level summary. Based on the individual article summaries below, create a high-level overview of the entire law.
+
+INDIVIDUAL ARTICLE SUMMARIES:
+{summaries}
+
+YOUR TASK:
+Create a JSON object with both Portuguese and English summaries of the entire law:
+
+{{
+  "pt": {{
+    "informal_summary_title": "A concise title in Portuguese summarizing the entire law",
+    "informal_summary": "A comprehensive summary in Portuguese of what this law accomplishes overall"
+  }},
+  "en": {{
+    "informal_summary_title": "A concise title in English summarizing the entire law", 
+    "informal_summary": "A comprehensive summary in English of what this law accomplishes overall"
+  }}
+}}"""
+
+_SUMMARY_MERGE_PROMPT_TMPL = """You are a legal expert. Merge the partial summaries below, which describe consecutive articles of the same law, into one concise English summary. Keep every distinct obligation, right and change they describe. Reply with the summary text only.
+
+PARTIAL SUMMARIES:
+{summaries}"""
+
+# Opening of the "analyses" array in a batch analysis response
+_ANALYSES_ARRAY_RE = re.compile(r'"analyses"\s*:\s*\[')
+
+
+def _salvage_analyses(response: str) -> List[Dict]:
+    """Decode the leading well-formed objects of a truncated or malformed "analyses" array."""
+    match = _ANALYSES_ARRAY_RE.search(response)
+    if not match:
+        return []
+    
+    decoder = json.JSONDecoder()
+    analyses = []
+    pos = match.end()
+    while True:
+        while pos < len(response) and response[pos] in ' \t\r\n,':
+            pos += 1
+        if pos >= len(response) or response[pos] == ']':
+            break
+        try:
+            item, pos = decoder.raw_decode(response, pos)
+        except json.JSONDecodeError:
+            break
+        if not isinstance(item, dict):
+            break
+        analyses.append(item)
+    return analyses
+
+
+def _parse_llm_json(response: str):
+    """Parse a Gemini JSON response, unwrapping a ``` fence or surrounding prose only when needed."""
+    try:
+        return json_utils.loads(response)
+    except json_utils.JSONDecodeError:
+        return json_utils.loads(json_utils.extract_json_text(response))
+
+
+def _iter_english_summaries(article_versions: List[Dict]) -> Iterator[str]:
+    """Yield the complete (non-truncated) English summaries of the given article versions."""
+    for article_version in article_versions:
+        en_summary = article_version.get('analysis_data', {}).get('analysis', {}).get('en', {}).get('informal_summary', '')
+        if en_summary and not en_summary.endswith('...'):
+            yield en_summary
+
+
+def _concatenated_law_summary(article_versions: List[Dict]) -> Dict:
+    """Law-level translations built directly from the article summaries, for laws too short to reduce."""
+    translations = {}
+    for lang in ('pt', 'en'):
+        analyses = [version.get('analysis_data', {}).get('analysis', {}).get(lang, {}) for version in article_versions]
+        summaries = list(dict.fromkeys(
+            analysis['informal_summary'] for analysis in analyses
+            if analysis.get('informal_summary') and not analysis['informal_summary'].endswith('...')
+        ))
+        if not summaries:
+            continue
+        title = next((analysis['informal_summary_title'] for analysis in analyses if analysis.get('informal_summary_title')), '')
+        translations[lang] = {'informal_summary_title': title, 'informal_summary': '\n\n'.join(summaries)}
+    return translations
+
+
 class KritisAnalyzerV4:
     """
     Kritis AI Analyzer V4.0 - Enhanced Legal Document Analysis System
@@ -34,6 +277,46 @@ class KritisAnalyzerV4:
     - Law-level summary generation
     """
     
+    # Concurrent Gemini batch requests during Stage 2 (bounded by the API rate limit)
+    MAX_ANALYSIS_WORKERS = int(os.getenv('KRITIS_MAX_ANALYSIS_WORKERS', '8'))
+    
+    # Concurrent sub-batch Gemini requests while re-analyzing a batch's failed articles
+    MAX_RETRY_WORKERS = int(os.getenv('KRITIS_MAX_RETRY_WORKERS', '5'))
+    
+    # Tag names per `in` lookup in the client-side tagging fallback (bounded by URL length)
+    TAG_LOOKUP_CHUNK_SIZE = 100
+    
+    # Cross-reference numbers OR-ed into a single laws lookup (bounded by URL length)
+    REF_LOOKUP_CHUNK_SIZE = 50
+    
+    # Gemini request timeout, retry with exponential backoff, and circuit breaker for sustained outages
+    GEMINI_TIMEOUT_SECONDS = float(os.getenv('KRITIS_GEMINI_TIMEOUT_SECONDS', '300'))
+    GEMINI_MAX_ATTEMPTS = int(os.getenv('KRITIS_GEMINI_MAX_ATTEMPTS', '4'))
+    GEMINI_BACKOFF_BASE_SECONDS = float(os.getenv('KRITIS_GEMINI_BACKOFF_BASE_SECONDS', '1'))
+    GEMINI_BACKOFF_MAX_SECONDS = float(os.getenv('KRITIS_GEMINI_BACKOFF_MAX_SECONDS', '30'))
+    GEMINI_BREAKER_FAILURES = int(os.getenv('KRITIS_GEMINI_BREAKER_FAILURES', '5'))
+    GEMINI_BREAKER_WINDOW_SECONDS = 60
+    GEMINI_BREAKER_COOLDOWN_SECONDS = 30
+    GEMINI_BREAKER_MAX_WAIT_SECONDS = int(os.getenv('KRITIS_GEMINI_BREAKER_MAX_WAIT_SECONDS', '300'))
+    
+    # Law category IDs shared across worker processes via a local file cache
+    CATEGORIES_CACHE_FILE = os.getenv(
+        'KRITIS_CATEGORIES_CACHE_FILE', os.path.join(tempfile.gettempdir(), 'agora_law_categories.json')
+    )
+    CATEGORIES_CACHE_TTL_SECONDS = int(os.getenv('KRITIS_CATEGORIES_CACHE_TTL_SECONDS', '3600'))
+    
+    # Articles tokenized per encode_batch call while batches are streamed to the workers
+    TOKENIZE_CHUNK_SIZE = 32
+    
+    # Reuse Gemini responses to identical prompts (off by default: V4 samples at the model's default temperature)
+    USE_LLM_CACHE = os.getenv('KRITIS_USE_LLM_CACHE', 'false').lower() == 'true'
+    
+    # Article summaries per law-summary prompt; larger laws are first merged group by group (at least 2 so merging shrinks the list)
+    SUMMARY_REDUCE_GROUP_SIZE = max(2, int(os.getenv('KRITIS_SUMMARY_REDUCE_GROUP_SIZE', '20')))
+    
+    # Below this much complete summary text the article summaries are saved as-is instead of reduced by Gemini
+    MIN_LAW_SUMMARY_INPUT_CHARS = 200
+    
     def __init__(self, model_version: str = "gemini-4.0-flash"):
         """Initialize Kritis 4.0 with enhanced capabilities."""
         self.supabase_admin = get_supabase_admin_client()
@@ -42,13 +325,74 @@ class KritisAnalyzerV4:
         # Initialize Gemini model
         self.model = genai.GenerativeModel('gemini-2.0-flash')
         self.model_version = model_version  # This will be "gemini-4.0-flash" for unique versioning
-        self._categories_cache = None
         self._tags_cache = None
+        self._gemini_breaker = _CircuitBreaker(
+            self.GEMINI_BREAKER_FAILURES, self.GEMINI_BREAKER_WINDOW_SECONDS, self.GEMINI_BREAKER_COOLDOWN_SECONDS
+        )
+        
+        # Master category list, fetched once and shared by every (concurrent) analysis call
+        self._categories_cache = self._load_category_ids()
+        self._categories_list_str = ', '.join(self._categories_cache)
+        
+        # Invariant prompt prefix (persona, style guide, example, categories) shared by all analysis calls
+        self._kritis_prompt_prefix = f"""You are "Kritis," an expert analyst and communicator for the Agora platform. Your mission is to translate complex legal articles into clear, simple, and understandable explanations for the public.
+
+YOUR STYLE GUIDE:
+- Plain Language: Use simple, everyday words. Avoid legal jargon.
+- Concise Structure: Use bullet points or numbered lists to break down conditions or rules.
+- Human-Centric Tone: Speak directly to the reader. Make it feel conversational and easy to understand.
+- No Intros: NEVER start your response with phrases like "This article is about" or "In summary." Go directly to the explanation.
+
+EXAMPLE of a PERFECT RESPONSE:
+
+Original Text: "Artigo 1.º - 1. O limite para o provimento em cargos públicos, fixado no artigo 4.º do Decreto n.º 16563... não é aplicável aos que antes de excederem a idade... se mantenham ao serviço sem interrupção..."
+
+Your Output for informal_summary_pt:
+```
+O limite de idade para cargos públicos é ignorado se:
+- Tiver tido serviço prévio contínuo ao estado; ou
+- Tiver tido interrupções de menos de 60 dias que não foram por sua culpa.
+
+Isto inclui todo o serviço prestado ao estado, como em agências autónomas ou autarquias locais.
+```
+
+CONTEXT:
+- Master Category List: {self._categories_list_str}
+"""
         
         # Token management for batch processing (reduced for safety)
         self.tokenizer = tiktoken.get_encoding("cl100k_base")
         self.max_tokens_per_batch = 4000  # Reduced from 6000 for better reliability
         
+    def _load_category_ids(self) -> List[str]:
+        """
+        Load law category IDs, sharing them across processes through a local JSON file
+        (KRITIS_CATEGORIES_CACHE_FILE) that is refreshed from Supabase after CATEGORIES_CACHE_TTL_SECONDS.
+        """
+        try:
+            if time.time() - os.path.getmtime(self.CATEGORIES_CACHE_FILE) < self.CATEGORIES_CACHE_TTL_SECONDS:
+                with open(self.CATEGORIES_CACHE_FILE, 'rb') as cache_file:
+                    category_ids = json_utils.loads(cache_file.read())
+                if isinstance(category_ids, list) and category_ids:
+                    return category_ids
+        except (OSError, ValueError):
+            pass
+        
+        categories_response = self.supabase_admin.table('law_categories').select('id').execute()
+        category_ids = [cat['id'] for cat in categories_response.data or []]
+        
+        if category_ids:
+            try:
+                # Write atomically so concurrent workers never read a partial file
+                cache_dir = os.path.dirname(self.CATEGORIES_CACHE_FILE) or '.'
+                with tempfile.NamedTemporaryFile('w', dir=cache_dir, delete=False, encoding='utf-8') as tmp_file:
+                    tmp_file.write(json_utils.dumps(category_ids))
+                os.replace(tmp_file.name, self.CATEGORIES_CACHE_FILE)
+            except OSError as e:
+                logger.warning(f"⚠️ Could not write categories cache {self.CATEGORIES_CACHE_FILE}: {e}")
+        
+        return category_ids
+    
     def run_enhanced_extractor_with_preamble(self, source_id: str) -> Dict:
         """
         Stage 1: Enhanced Extractor with Preamble Handling
@@ -56,6 +400,7 @@ class KritisAnalyzerV4:
         Implements PROD5.md Part 2 specifications.
         """
         logger.info(f"🏛️ Kritis 4.0 Stage 1: Enhanced Extractor with Preamble for source {source_id}")
+        stage_timestamp = datetime.now().isoformat()
         
         # Get source record with translations (header data from crawler)
         source_response = self.supabase_admin.table('sources').select('id, slug, type_id, translations').eq('id', source_id).execute()
@@ -72,7 +417,7 @@ class KritisAnalyzerV4:
             logger.info(f"📄 Source title (PT): {pt_title[:100]}")
         
         # Get all chunks for the source
-        chunks_response = self.supabase_admin.table('document_chunks').select('*').eq('source_id', source_id).order('chunk_index').execute()
+        chunks_response = self.supabase_admin.table('document_chunks').select('content, chunk_index').eq('source_id', source_id).order('chunk_index').execute()
         chunks = chunks_response.data or []
         
         if not chunks:
@@ -81,28 +426,31 @@ class KritisAnalyzerV4:
         # Store source_id for chunk-based parsing fallback
         self._current_source_id = source_id
         
-        all_content = ""
-        for chunk in chunks:
-            all_content += chunk['content'] + "\n\n"
+        all_content = "\n\n".join(chunk['content'] for chunk in chunks)
         
-        # Extract metadata from first chunk, enhanced with source translations
-        metadata = self._extract_metadata_from_content(chunks[0]['content'], source_translations, source_type_id)
+        # Metadata extraction (first chunk + source translations) and preamble/articles parsing
+        # (complete content) are independent Gemini calls: run them concurrently
+        with ThreadPoolExecutor(max_workers=2) as executor:
+            metadata_future = executor.submit(self._extract_metadata_from_content, chunks[0]['content'], source_translations, source_type_id)
+            preamble_future = executor.submit(self._parse_preamble_and_articles, all_content)
+            metadata = metadata_future.result()
+            preamble_data = preamble_future.result()
         
-        # Parse preamble and articles from complete content
-        preamble_data = self._parse_preamble_and_articles(all_content)
+        # Metadata and preamble/articles rows are saved together in one request
+        analysis_rows = []
         
         # Save metadata
         if metadata:
             metadata_analysis = {
                 'extracted_metadata': metadata,
-                'extraction_timestamp': datetime.now().isoformat()
+                'extraction_timestamp': stage_timestamp
             }
             
-            self.supabase_admin.table('source_ai_analysis').insert({
+            analysis_rows.append({
                 'source_id': source_id,
                 'model_version': f"{self.model_version}-extractor",
                 'analysis_data': metadata_analysis
-            }).execute()
+            })
         
         # Save preamble and articles structure
         preamble_analysis = {
@@ -110,19 +458,22 @@ class KritisAnalyzerV4:
             'articles': preamble_data['articles'],
             'total_articles_found': len(preamble_data['articles']),
             'has_preamble': bool(preamble_data['preamble_text'].strip()),
-            'parsing_timestamp': datetime.now().isoformat()
+            'parsing_timestamp': stage_timestamp
         }
         
-        self.supabase_admin.table('source_ai_analysis').insert({
+        analysis_rows.append({
             'source_id': source_id,
             'model_version': f"{self.model_version}-preamble-parser",
             'analysis_data': preamble_analysis
-        }).execute()
+        })
+        
+        self.supabase_admin.table('source_ai_analysis').insert(analysis_rows).execute()
         
         total_articles = len(preamble_data['articles'])
         has_preamble = bool(preamble_data['preamble_text'].strip())
         
         logger.info(f"🎯 Enhanced Extractor with Preamble completed: {total_articles} articles + preamble")
+        _gemini_response_cache.log_stats("Gemini")
         return {
             'metadata': metadata,
             'preamble_text': preamble_data['preamble_text'],
@@ -133,6 +484,13 @@ class KritisAnalyzerV4:
     
     def _extract_metadata_from_content(self, content: str, source_translations: Optional[Dict] = None, source_type_id: Optional[str] = None) -> Dict:
         """Extract document metadata from content, enhanced with source translations."""
+        today_iso = datetime.now().date().isoformat()
+        
+        # Skip Gemini when the source title alone determines the metadata
+        if source_translations:
+            fast_metadata = self._metadata_from_source_title(source_translations.get('pt', {}).get('title', ''))
+            if fast_metadata:
+                return fast_metadata
         
         # Prepare context hints from source translations
         context_hints = ""
@@ -181,17 +539,10 @@ For constitutional documents:
 TEXT TO ANALYZE:
 {content[:8000]}"""
 
-        response = self._call_gemini(extractor_prompt)
+        response = self._call_gemini(extractor_prompt, validate=_parse_llm_json)
         
         try:
-            json_text = response.strip()
-            if json_text.startswith('```json'):
-                json_text = json_text[7:]
-            if json_text.endswith('```'):
-                json_text = json_text[:-3]
-            json_text = json_text.strip()
-            
-            metadata = json.loads(json_text)
+            metadata = _parse_llm_json(response)
             
             # Override with source translations if official_title_pt is missing or generic
             if source_translations:
@@ -211,27 +562,18 @@ TEXT TO ANALYZE:
                         metadata['law_type_id'] = 'CONSTITUTION'
                         
                         # Set default constitution date if not found
-                        if not metadata.get('enactment_date') or metadata['enactment_date'] == datetime.now().date().isoformat():
+                        if not metadata.get('enactment_date') or metadata['enactment_date'] == today_iso:
                             metadata['enactment_date'] = '1976-04-02'  # Portuguese Constitution original date
                             logger.info("📅 Using default Portuguese Constitution date: 1976-04-02")
                         
                         logger.info("🏛️ Detected CONSTITUTION from source title")
             
             # Fix law type mapping to valid database values
-            law_type_mapping = {
-                "DECRETO_PRESIDENTE_REPUBLICA": "DECRETO_PR",
-                "DECRETO_LEI": "DECRETO_LEI",
-                "LEI": "LEI",
-                "RESOLUCAO": "RESOLUCAO",
-                "PORTARIA": "PORTARIA",
-                "DESPACHO": "DESPACHO",
-                "CONSTITUTION": "CONSTITUTION"
-            }
-            
-            if 'law_type_id' in metadata and metadata['law_type_id'] in law_type_mapping:
-                metadata['law_type_id'] = law_type_mapping[metadata['law_type_id']]
-            elif 'law_type_id' not in metadata or metadata['law_type_id'] not in ['CONSTITUTION', 'CONSTITUTIONAL_REVISION', 'PARLIAMENTARY_LAW', 'DECREE_LAW', 'REGULATION', 'RESOLUTION', 'INTERNATIONAL_TREATY', 'ACORDAO', 'ACORDAO_STA', 'ACORDAO_STJ', 'ACORDAO_TC', 'ACORDAO_T_CONTAS', 'ACORDAO_DOUTRINARIO', 'ACORDO', 'ADITAMENTO', 'ALTERACAO', 'ALVARA', 'ANUNCIO', 'ASSENTO', 'AVISO', 'AVISO_BP', 'CARTA_CONSTITUCIONAL', 'CARTA_ADESAO', 'CARTA_RATIFICACAO', 'CIRCULAR', 'COMUNICACAO', 'CONTRATO', 'CONVENCAO', 'DECISAO', 'DECLARACAO', 'DECLARACAO_RETIFICACAO', 'DECRETO', 'DECRETO_APROVACAO_CONSTITUICAO', 'DECRETO_GOVERNO', 'DECRETO_PR', 'DECRETO_LEGISLATIVO_REGIONAL', 'DECRETO_REGIONAL', 'DECRETO_REGULAMENTAR', 'DECRETO_REGULAMENTAR_REGIONAL', 'DECRETO_LEI', 'DELIBERACAO', 'DESPACHO', 'DESPACHO_CONJUNTO', 'DESPACHO_NORMATIVO', 'EDITAL', 'ERRATA', 'INSTRUCAO', 'JURISPRUDENCIA', 'LEI', 'LEI_CONSTITUCIONAL', 'LEI_ORGANICA', 'LISTA', 'MAPA', 'MAPA_OFICIAL', 'MOCAO', 'MOCAO_CENSURA', 'MOCAO_CONFIANCA', 'PARECER', 'PORTARIA', 'PROGRAMA', 'PROTOCOLO', 'REGIMENTO', 'REGULAMENTO', 'RESOLUCAO', 'RESOLUCAO_AR', 'RESOLUCAO_CM', 'TRATADO']:
-                metadata['law_type_id'] = 'DECRETO_LEI'  # Default fallback
+            law_type_id = metadata.get('law_type_id')
+            law_type_id = _LAW_TYPE_MAPPING.get(law_type_id, law_type_id)
+            if law_type_id not in _VALID_LAW_TYPES:
+                law_type_id = 'DECRETO_LEI'  # Default fallback
+            metadata['law_type_id'] = law_type_id
             
             return metadata
             
@@ -254,19 +596,75 @@ TEXT TO ANALYZE:
                 "official_number": f"AUTO-{int(time.time())}",
                 "official_title_pt": fallback_title,
                 "law_type_id": fallback_type,
-                "enactment_date": datetime.now().date().isoformat(),
+                "enactment_date": today_iso,
                 "summary_pt": "Análise não disponível"
             }
     
+    def _metadata_from_source_title(self, source_title: str) -> Optional[Dict]:
+        """
+        Derive metadata directly from the crawler's PT title for the common cases
+        (Constitution, "Decreto-Lei n.º NN/YYYY, de D de <mês>"). Returns None otherwise.
+        """
+        if not source_title:
+            return None
+        
+        title_lower = source_title.lower()
+        if 'constituição' in title_lower or 'crp' in title_lower:
+            logger.info("🏛️ Detected CONSTITUTION from source title, skipping metadata extraction")
+            return {
+                "official_number": "CRP",
+                "official_title_pt": source_title,
+                "law_type_id": "CONSTITUTION",
+                "enactment_date": "1976-04-02",
+                "summary_pt": ""
+            }
+        
+        match = _DECRETO_LEI_TITLE_RE.match(source_title)
+        if match:
+            number, number_year, day, month_name, date_year = match.groups()
+            try:
+                enactment_date = date(int(date_year or number_year), _PT_MONTHS[month_name.lower()], int(day))
+            except ValueError:
+                return None
+            logger.info(f"⚡ Parsed Decreto-Lei metadata from source title: {number}/{number_year}")
+            return {
+                "official_number": f"Decreto-Lei n.º {number}/{number_year}",
+                "official_title_pt": source_title,
+                "law_type_id": "DECRETO_LEI",
+                "enactment_date": enactment_date.isoformat(),
+                "summary_pt": ""
+            }
+        
+        return None
+    
     def _parse_preamble_and_articles(self, content: str) -> Dict:
         """
-        Parse preamble and articles using Enhanced Extractor AI.
+        Parse preamble and articles, splitting on article headers locally.
         Implements PROD5.md Part 2 specifications.
         
-        For very large documents, we use the chunk-based approach where each chunk
-        is likely already a separate article.
+        Only when fewer than two article headers are found do we fall back to the
+        Enhanced Extractor AI (or, for very large documents, the chunk-based
+        approach where each chunk is likely already a separate article).
         """
         
+        matches = list(_ARTICLE_SPLIT_RE.finditer(content))
+        if len(matches) >= 2:
+            articles = []
+            for i, match in enumerate(matches):
+                end = matches[i + 1].start() if i + 1 < len(matches) else len(content)
+                official_text = content[match.start():end].strip()
+                if official_text:
+                    articles.append({
+                        "article_number": f"Artigo {match.group(1)}.º",
+                        "official_text": official_text
+                    })
+            
+            logger.info(f"Regex parsing found: {len(articles)} articles")
+            return {
+                "preamble_text": content[:matches[0].start()].strip(),
+                "articles": articles
+            }
+        
         # Check if content is too large (> 100k chars) - use chunk-based approach
         if len(content) > 100000:
             logger.info("Large document detected, using chunk-based parsing approach")
@@ -296,17 +694,10 @@ Return a JSON object with the following structure:
   ]
 }}"""
 
-        response = self._call_gemini(parser_prompt)
+        response = self._call_gemini(parser_prompt, validate=_parse_llm_json)
         
         try:
-            json_text = response.strip()
-            if json_text.startswith('```json'):
-                json_text = json_text[7:]
-            if json_text.endswith('```'):
-                json_text = json_text[:-3]
-            json_text = json_text.strip()
-            
-            parsed_data = json.loads(json_text)
+            parsed_data = _parse_llm_json(response)
             
             # Validate structure
             if 'preamble_text' not in parsed_data:
@@ -342,7 +733,7 @@ Return a JSON object with the following structure:
             logger.error("Source ID not available for chunk-based parsing")
             return {"preamble_text": "", "articles": []}
         
-        chunks_response = self.supabase_admin.table('document_chunks').select('*').eq('source_id', self._current_source_id).order('chunk_index').execute()
+        chunks_response = self.supabase_admin.table('document_chunks').select('content, chunk_index').eq('source_id', self._current_source_id).order('chunk_index').execute()
         chunks = chunks_response.data or []
         
         if not chunks:
@@ -354,7 +745,7 @@ Return a JSON object with the following structure:
         articles = []
         
         # Check if first chunk looks like a preamble (doesn't start with article pattern)
-        if not re.match(r'^\s*(artigo|art\.)\s+\d+', first_chunk.lower().strip()):
+        if not _ARTICLE_HEAD_RE.match(first_chunk):
             preamble_text = first_chunk
             article_chunks = chunks[1:]
         else:
@@ -367,9 +758,9 @@ Return a JSON object with the following structure:
                 continue
                 
             # Extract article number from content
-            article_match = re.search(r'(artigo|art\.)\s+(\d+)', content.lower())
+            article_match = _ARTICLE_NUM_RE.search(content)
             if article_match:
-                article_num = article_match.group(2)
+                article_num = article_match.group(1)
                 article_number = f"Artigo {article_num}.º"
             else:
                 # Use chunk index as fallback
@@ -393,6 +784,7 @@ Return a JSON object with the following structure:
         Implements PROD5.md Part 3 specifications.
         """
         logger.info(f"🧠 Kritis 4.0 Stage 2: Enhanced Analyst with Context for source {source_id}")
+        stage_start = datetime.now()
         
         # Get preamble and articles data
         preamble_response = self.supabase_admin.table('source_ai_analysis').select('*').eq('source_id', source_id).eq('model_version', f"{self.model_version}-preamble-parser").execute()
@@ -408,40 +800,47 @@ Return a JSON object with the following structure:
         metadata_response = self.supabase_admin.table('source_ai_analysis').select('*').eq('source_id', source_id).eq('model_version', f"{self.model_version}-extractor").execute()
         
         document_title = "Unknown Document"
-        default_enactment_date = datetime.now().date().isoformat()  # Fallback
+        default_enactment_date = stage_start.date().isoformat()  # Fallback
         if metadata_response.data:
             metadata = metadata_response.data[0]['analysis_data']['extracted_metadata']
             document_title = metadata.get('official_title_pt', 'Unknown Document')
             if metadata.get('enactment_date'):
                 default_enactment_date = metadata['enactment_date']
         
-        # Analyze preamble first (article 0)
         all_analyses = []
-        if preamble_text.strip():
-            logger.info("Analyzing preamble as article 0")
-            preamble_analysis = self._analyze_content_with_context(
-                content=preamble_text,
-                article_number="0",
-                document_title=document_title,
-                preamble_context=preamble_text,
-                is_preamble=True
-            )
-            all_analyses.append(preamble_analysis)
-        
-        # Smart batching for articles with robust error handling
-        if articles:
-            batches = self._create_smart_batches_v4(articles)
-            logger.info(f"Created {len(batches)} batches for {len(articles)} articles")
+        batch_futures = []
+        # Preamble (article 0) and article batches are independent Gemini calls: run them all
+        # in one pool, submitting each batch as soon as the tokenizer closes it so tokenization
+        # overlaps with in-flight requests; results are collected in document order
+        with ThreadPoolExecutor(max_workers=self.MAX_ANALYSIS_WORKERS) as executor:
+            preamble_future = None
+            if preamble_text.strip():
+                logger.info("Analyzing preamble as article 0")
+                preamble_future = executor.submit(
+                    self._analyze_content_with_context,
+                    content=preamble_text,
+                    article_number="0",
+                    document_title=document_title,
+                    preamble_context=preamble_text,
+                    is_preamble=True
+                )
             
-            for i, batch in enumerate(batches):
-                logger.info(f"Processing batch {i+1}/{len(batches)} with {len(batch)} articles")
-                
-                batch_analyses = self._analyze_article_batch_with_robust_retry(
+            # Smart batching for articles with robust error handling
+            for i, batch in enumerate(self._create_smart_batches_v4(articles)):
+                logger.info(f"Submitting batch {i+1} with {len(batch)} articles")
+                batch_futures.append(executor.submit(
+                    self._analyze_article_batch_with_robust_retry,
                     batch=batch,
                     document_title=document_title,
                     preamble_context=preamble_text
-                )
-                all_analyses.extend(batch_analyses)
+                ))
+            if articles:
+                logger.info(f"Created {len(batch_futures)} batches for {len(articles)} articles")
+            
+            if preamble_future is not None:
+                all_analyses.append(preamble_future.result())
+            for future in batch_futures:
+                all_analyses.extend(future.result())
         
         # Save complete analysis results with completion tracking
         successful_analyses = 0
@@ -464,8 +863,8 @@ Return a JSON object with the following structure:
             'failed_analyses': failed_analyses,
             'completion_rate': round((successful_analyses / len(all_analyses)) * 100, 2) if all_analyses else 0,
             'has_preamble_analysis': bool(preamble_text.strip()),
-            'batches_processed': len(batches) if articles else 0,
-            'analysis_timestamp': datetime.now().isoformat()
+            'batches_processed': len(batch_futures),
+            'analysis_timestamp': stage_start.isoformat()
         }
         
         self.supabase_admin.table('source_ai_analysis').insert({
@@ -475,30 +874,33 @@ Return a JSON object with the following structure:
         }).execute()
         
         logger.info(f"🎯 Enhanced Analyst completed: {len(all_analyses)} items analyzed")
+        _gemini_response_cache.log_stats("Gemini")
         return complete_analysis
     
-    def _create_smart_batches_v4(self, articles: List[Dict]) -> List[List[Dict]]:
-        """Create smart batches for articles (from V3 with minor updates)."""
-        batches = []
+    def _create_smart_batches_v4(self, articles: List[Dict]) -> Iterator[List[Dict]]:
+        """Yield smart batches for articles as soon as each one is complete (from V3 with minor updates)."""
         current_batch = []
         current_token_count = 0
         
-        for article in articles:
-            article_text = article.get('official_text', '')
-            article_tokens = len(self.tokenizer.encode(article_text))
+        for start in range(0, len(articles), self.TOKENIZE_CHUNK_SIZE):
+            chunk = articles[start:start + self.TOKENIZE_CHUNK_SIZE]
+            # Tokenize a slice of articles per call (tiktoken parallelizes encode_batch internally)
+            token_counts = [
+                len(tokens) for tokens in
+                self.tokenizer.encode_batch([article.get('official_text', '') for article in chunk])
+            ]
             
-            if current_token_count + article_tokens > self.max_tokens_per_batch and current_batch:
-                batches.append(current_batch)
-                current_batch = [article]
-                current_token_count = article_tokens
-            else:
-                current_batch.append(article)
-                current_token_count += article_tokens
+            for article, article_tokens in zip(chunk, token_counts):
+                if current_token_count + article_tokens > self.max_tokens_per_batch and current_batch:
+                    yield current_batch
+                    current_batch = [article]
+                    current_token_count = article_tokens
+                else:
+                    current_batch.append(article)
+                    current_token_count += article_tokens
         
         if current_batch:
-            batches.append(current_batch)
-        
-        return batches
+            yield current_batch
     
     def _analyze_content_with_context(self, content: str, article_number: str, document_title: str, preamble_context: str, is_preamble: bool = False) -> Dict:
         """
@@ -506,39 +908,9 @@ Return a JSON object with the following structure:
         Implements PROD5.md Part 3 enhanced prompt.
         """
         
-        # Get categories for context
-        if self._categories_cache is None:
-            categories_response = self.supabase_admin.table('law_categories').select('id').execute()
-            self._categories_cache = [cat['id'] for cat in categories_response.data or []]
-        
-        categories_list = ', '.join(self._categories_cache)
-        
         content_type = "preamble" if is_preamble else "article"
         
-        kritis_prompt = f"""You are "Kritis," an expert analyst and communicator for the Agora platform. Your mission is to translate complex legal articles into clear, simple, and understandable explanations for the public.
-
-YOUR STYLE GUIDE:
-- Plain Language: Use simple, everyday words. Avoid legal jargon.
-- Concise Structure: Use bullet points or numbered lists to break down conditions or rules.
-- Human-Centric Tone: Speak directly to the reader. Make it feel conversational and easy to understand.
-- No Intros: NEVER start your response with phrases like "This article is about" or "In summary." Go directly to the explanation.
-
-EXAMPLE of a PERFECT RESPONSE:
-
-Original Text: "Artigo 1.º - 1. O limite para o provimento em cargos públicos, fixado no artigo 4.º do Decreto n.º 16563... não é aplicável aos que antes de excederem a idade... se mantenham ao serviço sem interrupção..."
-
-Your Output for informal_summary_pt:
-```
-O limite de idade para cargos públicos é ignorado se:
-- Tiver tido serviço prévio contínuo ao estado; ou
-- Tiver tido interrupções de menos de 60 dias que não foram por sua culpa.
-
-Isto inclui todo o serviço prestado ao estado, como em agências autónomas ou autarquias locais.
-```
-
-CONTEXT:
-- Master Category List: {categories_list}
-- This {content_type.capitalize()} Belongs To: {document_title}
+        kritis_prompt = self._kritis_prompt_prefix + f"""- This {content_type.capitalize()} Belongs To: {document_title}
 - Law Preamble: {preamble_context[:1000]}...
 
 {content_type.upper()} TEXT TO ANALYZE:
@@ -593,17 +965,10 @@ Return a single, valid JSON object with the following structure. Do not include
   }}
 }}"""
 
-        response = self._call_gemini(kritis_prompt)
+        response = self._call_gemini(kritis_prompt, validate=_parse_llm_json)
         
         try:
-            json_text = response.strip()
-            if json_text.startswith('```json'):
-                json_text = json_text[7:]
-            if json_text.endswith('```'):
-                json_text = json_text[:-3]
-            json_text = json_text.strip()
-            
-            analysis_data = json.loads(json_text)
+            analysis_data = _parse_llm_json(response)
             
             # Ensure article_number is set correctly
             analysis_data['article_number'] = article_number
@@ -643,99 +1008,92 @@ Return a single, valid JSON object with the following structure. Do not include
     def _analyze_article_batch_with_robust_retry(self, batch: List[Dict], document_title: str, preamble_context: str) -> List[Dict]:
         """
         Analyze batch of articles with robust retry logic and error handling.
-        Implements multiple retry strategies to avoid analysis errors.
+        Only articles whose analyses fail validation are re-queued, in sub-batches that halve
+        in size each round; articles still failing on their own get a fallback analysis.
         """
+        results: List[Optional[Dict]] = [None] * len(batch)
+        pending = list(range(len(batch)))
+        batch_size = len(batch)
+        attempt = 0
         
-        # First attempt: try the full batch
-        logger.info(f"Attempt 1: Analyzing full batch of {len(batch)} articles")
-        try:
-            analyses = self._analyze_article_batch_with_context(batch, document_title, preamble_context)
+        def analyze_indices(indices):
+            chunk = [batch[i] for i in indices]
+            try:
+                return indices, self._analyze_article_batch_with_context(chunk, document_title, preamble_context)
+            except Exception as e:
+                logger.warning(f"⚠️ Analysis of {len(chunk)} articles failed: {e}")
+                return indices, []
+        
+        while pending:
+            # Gemini is failing persistently: wait out the cooldown instead of saving fallback analyses
+            self._wait_for_gemini_breaker()
             
-            # Validate that all analyses are complete
-            if self._validate_batch_analyses(analyses, batch):
-                logger.info(f"✅ Full batch analysis successful")
-                return analyses
+            attempt += 1
+            chunks = [pending[i:i + batch_size] for i in range(0, len(pending), batch_size)]
+            logger.info(f"Attempt {attempt}: Analyzing {len(pending)} articles in {len(chunks)} batch(es) of up to {batch_size}")
+            
+            failed = []
+            # Sub-batches of a retry round are independent Gemini calls
+            with ThreadPoolExecutor(max_workers=min(len(chunks), self.MAX_RETRY_WORKERS)) as executor:
+                for indices, analyses in executor.map(analyze_indices, chunks):
+                    # Element i answers article i only when the counts match
+                    if len(analyses) != len(indices):
+                        failed.extend(indices)
+                        continue
+                    for i, analysis in zip(indices, analyses):
+                        if self._is_valid_analysis(analysis):
+                            results[i] = analysis
+                        else:
+                            failed.append(i)
+            
+            if not failed:
+                logger.info(f"✅ Batch analysis complete after {attempt} attempt(s)")
+            elif self._gemini_breaker.is_open():
+                # The outage failed these calls, not the articles: retry the same round once it clears
+                logger.warning(f"⚠️ Gemini circuit breaker opened, retrying {len(failed)} articles after the cooldown")
+                pending = failed
+                continue
+            elif batch_size == 1:
+                logger.warning(f"⚠️ {len(failed)} articles could not be analyzed individually")
+                pending = failed
+                break
             else:
-                logger.warning(f"⚠️ Full batch analysis incomplete, trying smaller batches")
-                
-        except Exception as e:
-            logger.warning(f"⚠️ Full batch analysis failed: {e}")
+                logger.warning(f"⚠️ {len(failed)} articles incomplete, retrying them in smaller batches")
+            
+            pending = failed
+            batch_size = max(1, batch_size // 2)
         
-        # Second attempt: split into smaller batches (max 5 articles each)
-        logger.info(f"Attempt 2: Splitting into smaller batches")
-        smaller_batches = self._create_smaller_batches(batch, max_size=5)
-        all_analyses = []
+        for i in pending:
+            results[i] = self._create_fallback_analysis(batch[i])
         
-        for i, small_batch in enumerate(smaller_batches):
-            logger.info(f"Processing small batch {i+1}/{len(smaller_batches)} with {len(small_batch)} articles")
-            try:
-                small_analyses = self._analyze_article_batch_with_context(small_batch, document_title, preamble_context)
-                
-                if self._validate_batch_analyses(small_analyses, small_batch):
-                    all_analyses.extend(small_analyses)
-                else:
-                    logger.warning(f"Small batch {i+1} incomplete, trying individual articles")
-                    # Fall back to individual analysis for this batch
-                    individual_analyses = self._analyze_articles_individually(small_batch, document_title, preamble_context)
-                    all_analyses.extend(individual_analyses)
-                    
-            except Exception as e:
-                logger.warning(f"Small batch {i+1} failed: {e}, trying individual articles")
-                # Fall back to individual analysis
-                individual_analyses = self._analyze_articles_individually(small_batch, document_title, preamble_context)
-                all_analyses.extend(individual_analyses)
-        
-        return all_analyses
+        return results
     
-    def _create_smaller_batches(self, articles: List[Dict], max_size: int) -> List[List[Dict]]:
-        """Create smaller batches with maximum size."""
-        smaller_batches = []
-        for i in range(0, len(articles), max_size):
-            smaller_batches.append(articles[i:i + max_size])
-        return smaller_batches
+    def _wait_for_gemini_breaker(self):
+        """Block while the Gemini circuit breaker is open; stop the run if it stays open too long."""
+        deadline = time.monotonic() + self.GEMINI_BREAKER_MAX_WAIT_SECONDS
+        while self._gemini_breaker.is_open():
+            if time.monotonic() >= deadline:
+                raise RuntimeError(f"Gemini circuit breaker still open after {self.GEMINI_BREAKER_MAX_WAIT_SECONDS}s, stopping analysis")
+            time.sleep(1)
     
     def _validate_batch_analyses(self, analyses: List[Dict], original_batch: List[Dict]) -> bool:
         """Validate that batch analyses are complete and correct."""
         if len(analyses) != len(original_batch):
             return False
         
-        for analysis in analyses:
-            # Check for error indicators
-            if 'analysis' not in analysis:
-                return False
-            
-            if 'pt' in analysis['analysis']:
-                pt_title = analysis['analysis']['pt'].get('informal_summary_title', '')
-                if 'não processado' in pt_title.lower() or 'not processed' in pt_title.lower():
-                    return False
-        
-        return True
+        return all(self._is_valid_analysis(analysis) for analysis in analyses)
     
-    def _analyze_articles_individually(self, articles: List[Dict], document_title: str, preamble_context: str) -> List[Dict]:
-        """Analyze articles one by one as final fallback."""
-        logger.info(f"Final attempt: Analyzing {len(articles)} articles individually")
-        individual_analyses = []
+    def _is_valid_analysis(self, analysis: Dict) -> bool:
+        """Check a single article analysis for error indicators."""
+        if not isinstance(analysis, dict) or 'analysis' not in analysis:
+            return False
         
-        for article in articles:
-            try:
-                # Create a single-article batch
-                single_batch = [article]
-                analysis = self._analyze_article_batch_with_context(single_batch, document_title, preamble_context)
-                
-                if analysis and len(analysis) > 0:
-                    individual_analyses.append(analysis[0])
-                else:
-                    # Create fallback analysis
-                    fallback_analysis = self._create_fallback_analysis(article)
-                    individual_analyses.append(fallback_analysis)
-                    
-            except Exception as e:
-                logger.error(f"Individual analysis failed for article {article.get('article_number', 'Unknown')}: {e}")
-                # Create fallback analysis
-                fallback_analysis = self._create_fallback_analysis(article)
-                individual_analyses.append(fallback_analysis)
+        if 'pt' in analysis['analysis']:
+            pt_title = analysis['analysis']['pt'].get('informal_summary_title', '')
+            if _UNPROCESSED_TITLE_RE.search(pt_title):
+                return False
         
-        return individual_analyses
+        return True
     
     def _create_fallback_analysis(self, article: Dict) -> Dict:
         """Create a fallback analysis structure when AI analysis fails."""
@@ -768,45 +1126,29 @@ Return a single, valid JSON object with the following structure. Do not include
         Similar to V3 but with enhanced prompting from PROD5.md.
         """
         
-        # Get categories for context
-        if self._categories_cache is None:
-            categories_response = self.supabase_admin.table('law_categories').select('id').execute()
-            self._categories_cache = [cat['id'] for cat in categories_response.data or []]
-        
-        categories_list = ', '.join(self._categories_cache)
-        batch_json = json.dumps(batch, ensure_ascii=False, indent=2)
-        
-        kritis_prompt = f"""You are "Kritis," an expert analyst and communicator for the Agora platform. Your mission is to translate complex legal articles into clear, simple, and understandable explanations for the public.
-
-YOUR STYLE GUIDE:
-- Plain Language: Use simple, everyday words. Avoid legal jargon.
-- Concise Structure: Use bullet points or numbered lists to break down conditions or rules.
-- Human-Centric Tone: Speak directly to the reader. Make it feel conversational and easy to understand.
-- No Intros: NEVER start your response with phrases like "This article is about" or "In summary." Go directly to the explanation.
-
-EXAMPLE of a PERFECT RESPONSE:
-
-Original Text: "Artigo 1.º - 1. O limite para o provimento em cargos públicos, fixado no artigo 4.º do Decreto n.º 16563... não é aplicável aos que antes de excederem a idade... se mantenham ao serviço sem interrupção..."
-
-Your Output for informal_summary_pt:
-```
-O limite de idade para cargos públicos é ignorado se:
-- Tiver tido serviço prévio contínuo ao estado; ou
-- Tiver tido interrupções de menos de 60 dias que não foram por sua culpa.
-
-Isto inclui todo o serviço prestado ao estado, como em agências autónomas ou autarquias locais.
-```
-
-CONTEXT:
-- Master Category List: {categories_list}
-- This Law's Title: {document_title}
+        # Compact JSON with only the fields the model needs keeps the input tokens down
+        batch_json = json_utils.dumps([
+            {'article_number': article.get('article_number'), 'official_text': article.get('official_text', '')}
+            for article in batch
+        ])
+        
+        # Identical inputs (e.g. a re-run or retry of the same batch) reuse the validated result
+        cache_key = hashlib.sha256('\x1f'.join((
+            self.model_version, self._categories_list_str, document_title, preamble_context[:1000], batch_json
+        )).encode('utf-8')).hexdigest()
+        cached_analyses = _get_cached_batch_analyses(cache_key)
+        if cached_analyses is not None:
+            logger.info(f"♻️ Reusing cached analysis for batch of {len(batch)} articles")
+            return cached_analyses
+        
+        kritis_prompt = self._kritis_prompt_prefix + f"""- This Law's Title: {document_title}
 - Law Preamble: {preamble_context[:1000]}...
 
-ARTICLES TO ANALYZE:
+ARTICLES TO ANALYZE ({len(batch)} articles):
 {batch_json}
 
 YOUR TASK:
-For each article in the input array, perform a detailed analysis following the style guide above. Return a single, valid JSON object containing one key, "analyses". This key must be an array where each object corresponds to an input article and has the following structure:
+For each of the {len(batch)} articles in the input array, perform a detailed analysis following the style guide above. Return a single, valid JSON object containing one key, "analyses". This key must be an array of exactly {len(batch)} objects, where element i is the analysis of input article i, in the same order, with the following structure:
 
 {{
   "analyses": [
@@ -853,22 +1195,23 @@ For each article in the input array, perform a detailed analysis following the s
   ]
 }}"""
 
-        response = self._call_gemini(kritis_prompt)
+        response = self._call_gemini(kritis_prompt, validate=_parse_llm_json)
         
         try:
-            json_text = response.strip()
-            if json_text.startswith('```json'):
-                json_text = json_text[7:]
-            if json_text.endswith('```'):
-                json_text = json_text[:-3]
-            json_text = json_text.strip()
-            
-            analysis_data = json.loads(json_text)
+            analysis_data = _parse_llm_json(response)
             analyses = analysis_data.get('analyses', [])
             
             # Validate analyses match batch articles
             if len(analyses) != len(batch):
                 logger.warning(f"Analysis count ({len(analyses)}) doesn't match batch size ({len(batch)})")
+            else:
+                # Element i answers article i: pin the article_number to the input's
+                for article, analysis in zip(batch, analyses):
+                    if article.get('article_number'):
+                        analysis['article_number'] = article['article_number']
+            
+            if self._validate_batch_analyses(analyses, batch):
+                _cache_batch_analyses(cache_key, analyses)
             
             return analyses
             
@@ -876,9 +1219,17 @@ For each article in the input array, perform a detailed analysis following the s
             logger.error(f"Invalid JSON response from batch analyst: {e}")
             logger.error(f"Raw response: {response[:500]}")
             
-            # Return fallback analyses
-            fallback_analyses = []
-            for article in batch:
+            # Keep the well-formed analyses Gemini emitted before the output broke
+            salvaged_analyses = _salvage_analyses(response)[:len(batch)]
+            if salvaged_analyses:
+                logger.warning(f"Recovered {len(salvaged_analyses)}/{len(batch)} analyses; first malformed element at index {len(salvaged_analyses)}")
+                for article, analysis in zip(batch, salvaged_analyses):
+                    if article.get('article_number'):
+                        analysis['article_number'] = article['article_number']
+            
+            # Return fallback analyses for the rest
+            fallback_analyses = salvaged_analyses
+            for article in batch[len(salvaged_analyses):]:
                 fallback_analyses.append({
                     "article_number": article.get('article_number', 'Unknown'),
                     "suggested_category_id": "ADMINISTRATIVE",
@@ -909,39 +1260,63 @@ For each article in the input array, perform a detailed analysis following the s
         """
         logger.info(f"📚 Kritis 4.0 Stage 3: Intelligent Knowledge Graph Builder for source {source_id}")
         
-        # Step 1: Create the parent law
-        law_id = self._create_law_from_metadata_v4(source_id)
-        logger.info(f"✅ Created law record: {law_id}")
+        # Stage 1/2 outputs for this source, fetched once for every step below
+        source_analyses = self._load_source_analyses(source_id)
         
-        # Step 2: Create articles and versions (including preamble as article 0)
-        article_versions = self._create_articles_with_preamble(source_id, law_id)
-        logger.info(f"✅ Created {len(article_versions)} article versions (including preamble)")
+        # Steps 1-2: Create the parent law, its articles and versions (including preamble as article 0)
+        law_data = self._build_law_data(source_id, source_analyses)
+        article_rows = self._prepare_article_rows(source_id, source_analyses)
         
-        # Step 3: Perform intelligent entity-driven tagging
-        self._perform_intelligent_tagging(article_versions)
-        logger.info(f"✅ Intelligent tagging completed")
-        
-        # Step 4: Perform enhanced relational linking
-        self._perform_enhanced_relational_linking(article_versions)
-        logger.info(f"✅ Enhanced relational linking completed")
+        created = self._create_law_with_articles_via_rpc(law_data, article_rows)
+        if created:
+            law_id, article_versions = created
+        else:
+            law_id = self._create_law_from_metadata_v4(law_data)
+            article_versions = self._create_articles_with_preamble(law_id, article_rows)
+        logger.info(f"✅ Created law record: {law_id}")
+        logger.info(f"✅ Created {len(article_versions)} article versions (including preamble)")
         
-        # Step 5: Generate final law-level summary (reduce phase)
-        self._generate_law_level_summary(source_id, law_id, article_versions)
-        logger.info(f"✅ Law-level summary completed")
+        # Steps 3-5 only read article_versions and write disjoint tables: run them concurrently
+        with ThreadPoolExecutor(max_workers=3) as executor:
+            # Step 3: Perform intelligent entity-driven tagging
+            tagging_future = executor.submit(self._perform_intelligent_tagging, article_versions)
+            # Step 4: Perform enhanced relational linking
+            linking_future = executor.submit(self._perform_enhanced_relational_linking, article_versions, law_id)
+            # Step 5: Generate final law-level summary (reduce phase)
+            summary_future = executor.submit(self._generate_law_level_summary, source_id, law_id, article_versions)
+            
+            tagging_future.result()
+            logger.info(f"✅ Intelligent tagging completed")
+            linking_future.result()
+            logger.info(f"✅ Enhanced relational linking completed")
+            summary_future.result()
+            logger.info(f"✅ Law-level summary completed")
         
         logger.info(f"🎯 Intelligent Knowledge Graph Builder completed: {law_id}")
+        _gemini_response_cache.log_stats("Gemini")
         return law_id
     
-    def _create_law_from_metadata_v4(self, source_id: str) -> str:
-        """Create law record using extracted metadata (enhanced from V3)."""
+    def _load_source_analyses(self, source_id: str) -> Dict[str, Dict]:
+        """
+        Fetch the latest analysis_data of every Kritis 4.0 stage for a source in one query,
+        keyed by model_version suffix ('extractor', 'preamble-parser', 'enhanced-analyst').
+        """
+        prefix = f"{self.model_version}-"
+        response = self.supabase_admin.table('source_ai_analysis').select('model_version, analysis_data').eq('source_id', source_id).like('model_version', f"{prefix}%").order('created_at', desc=True).execute()
         
-        # Get extracted metadata
-        metadata_response = self.supabase_admin.table('source_ai_analysis').select('*').eq('source_id', source_id).eq('model_version', f"{self.model_version}-extractor").execute()
+        source_analyses = {}
+        for row in response.data or []:
+            source_analyses.setdefault(row['model_version'][len(prefix):], row['analysis_data'])
+        return source_analyses
+    
+    def _build_law_data(self, source_id: str, source_analyses: Dict[str, Dict]) -> Dict:
+        """Build the law record from extracted metadata (enhanced from V3)."""
         
-        if not metadata_response.data:
+        # Get extracted metadata
+        if 'extractor' not in source_analyses:
             raise ValueError(f"No metadata extraction found for source {source_id}")
         
-        metadata = metadata_response.data[0]['analysis_data']['extracted_metadata']
+        metadata = source_analyses['extractor']['extracted_metadata']
         
         # Get Portugal entity
         portugal_entity = self.supabase_admin.table('government_entities').select('id').eq('name', 'Portugal').limit(1).execute()
@@ -955,13 +1330,13 @@ For each article in the input array, perform a detailed analysis following the s
         enactment_date = metadata.get('enactment_date', None)
         
         # Create slug: dl-49031-19690527 (from official_number)
-        slug_base = re.sub(r'[^a-zA-Z0-9]', '-', official_number.lower())
+        slug_base = _SLUG_INVALID_RE.sub('-', official_number.lower())
         if enactment_date:
             date_part = enactment_date.replace('-', '')
             slug = f"{slug_base}-{date_part}"
         else:
             slug = slug_base
-        slug = re.sub(r'-+', '-', slug).strip('-')
+        slug = _DASH_RUN_RE.sub('-', slug).strip('-')
         
         # Prepare law data with corrected field mapping
         law_data = {
@@ -974,37 +1349,82 @@ For each article in the input array, perform a detailed analysis following the s
             'translations': None  # Will be populated by reduce phase
         }
         
-        # Insert law record
+        return law_data
+    
+    def _create_law_with_articles_via_rpc(self, law_data: Dict, article_rows: List[Dict]) -> Optional[Tuple[str, List[Dict]]]:
+        """
+        Create the law, articles and versions in one transaction via agora.create_law_with_articles.
+        Returns (law_id, article_versions), or None if the function is not deployed.
+        """
+        try:
+            response = self.supabase_admin.rpc('create_law_with_articles', {
+                'law_row': law_data,
+                'articles': [
+                    {
+                        'article_number': item['clean_article_number'],
+                        'mandate_id': item['mandate_id'],
+                        'status_id': 'ACTIVE',
+                        'valid_from': item['effective_date'],
+                        'official_text': item['official_text'],
+                        'translations': item['translations']
+                    }
+                    for item in article_rows
+                ]
+            }).execute()
+        except Exception as e:
+            # Data errors must surface, not be retried as a second, client-side law
+            if not is_missing_function_error(e):
+                raise
+            logger.warning(f"⚠️ create_law_with_articles RPC unavailable, creating rows client-side: {e}")
+            return None
+        
+        result = response.data or {}
+        created_rows = result.get('articles') or []
+        if not result.get('law_id') or len(created_rows) != len(article_rows):
+            raise Exception("Failed to create law record with articles")
+        
+        article_versions = [
+            {
+                'version_id': created['version_id'],
+                'article_id': created['article_id'],
+                'article_number': item['article_number'],
+                'official_text': item['official_text'],
+                'analysis_data': item['analysis_data']
+            }
+            for item, created in zip(article_rows, created_rows)
+        ]
+        return result['law_id'], article_versions
+    
+    def _create_law_from_metadata_v4(self, law_data: Dict) -> str:
+        """Insert the law record (client-side fallback of create_law_with_articles)."""
+        
         response = self.supabase_admin.table('laws').insert(law_data).execute()
         if not response.data:
             raise Exception("Failed to create law record")
         
         return response.data[0]['id']
     
-    def _create_articles_with_preamble(self, source_id: str, law_id: str) -> List[Dict]:
+    def _prepare_article_rows(self, source_id: str, source_analyses: Dict[str, Dict]) -> List[Dict]:
         """
-        Create articles including preamble as article 0.
+        Prepare article/version rows including preamble as article 0.
         Enhanced from V3 to handle preamble properly.
         """
         
         # Get enhanced analyses
-        analyses_response = self.supabase_admin.table('source_ai_analysis').select('*').eq('source_id', source_id).eq('model_version', f"{self.model_version}-enhanced-analyst").execute()
-        
-        if not analyses_response.data:
+        if 'enhanced-analyst' not in source_analyses:
             raise ValueError(f"No enhanced analyses found for source {source_id}")
         
-        all_analyses = analyses_response.data[0]['analysis_data']['analyses']
+        all_analyses = source_analyses['enhanced-analyst']['analyses']
         
         # Get preamble and articles for original text matching
-        preamble_response = self.supabase_admin.table('source_ai_analysis').select('*').eq('source_id', source_id).eq('model_version', f"{self.model_version}-preamble-parser").execute()
-        preamble_data = preamble_response.data[0]['analysis_data']
+        if 'preamble-parser' not in source_analyses:
+            raise ValueError(f"No preamble parsing data found for source {source_id}")
+        preamble_data = source_analyses['preamble-parser']
         
         # Get metadata for date context
-        metadata_response = self.supabase_admin.table('source_ai_analysis').select('*').eq('source_id', source_id).eq('model_version', f"{self.model_version}-extractor").execute()
-        
         default_enactment_date = datetime.now().date().isoformat()  # Fallback
-        if metadata_response.data:
-            metadata = metadata_response.data[0]['analysis_data']['extracted_metadata']
+        if 'extractor' in source_analyses:
+            metadata = source_analyses['extractor']['extracted_metadata']
             if metadata.get('enactment_date'):
                 default_enactment_date = metadata['enactment_date']
         
@@ -1022,7 +1442,7 @@ For each article in the input array, perform a detailed analysis following the s
             raise Exception("No mandate found")
         mandate_id = mandate_response.data[0]['id']
         
-        article_versions = []
+        prepared = []
         
         for analysis in all_analyses:
             try:
@@ -1033,21 +1453,9 @@ For each article in the input array, perform a detailed analysis following the s
                     clean_article_number = '0'
                 else:
                     # Extract clean article number for database
-                    clean_article_number = re.sub(r'[^\d]', '', article_number)
+                    clean_article_number = _NON_DIGIT_RE.sub('', article_number)
                     if not clean_article_number:
-                        clean_article_number = str(len(article_versions) + 1)
-                
-                # Create article
-                article_data = {
-                    'law_id': law_id,
-                    'article_number': clean_article_number
-                }
-                
-                article_response = self.supabase_admin.table('law_articles').insert(article_data).execute()
-                if not article_response.data:
-                    raise Exception(f"Failed to create article {article_number}")
-                
-                article_id = article_response.data[0]['id']
+                        clean_article_number = str(len(prepared) + 1)
                 
                 # Get original text
                 original_text = text_map.get(article_number, 'Text not found')
@@ -1073,44 +1481,78 @@ For each article in the input array, perform a detailed analysis following the s
                                 dates = lang_data['key_dates']
                                 if 'Effective Date' in dates and dates['Effective Date']:
                                     try:
-                                        datetime.strptime(dates['Effective Date'], '%Y-%m-%d')
-                                        effective_date = dates['Effective Date']
+                                        # YYYY-MM-DD shape (3.11+ fromisoformat also accepts other ISO forms) and a real date
+                                        if _ISO_DATE_RE.fullmatch(dates['Effective Date']):
+                                            date.fromisoformat(dates['Effective Date'])
+                                            effective_date = dates['Effective Date']
                                     except (ValueError, TypeError):
                                         pass
                 
-                version_data = {
-                    'article_id': article_id,
-                    'mandate_id': mandate_id,
-                    'status_id': 'ACTIVE',
-                    'valid_from': effective_date,
-                    'official_text': original_text,
-                    'translations': translations
-                }
-                
-                version_response = self.supabase_admin.table('law_article_versions').insert(version_data).execute()
-                if not version_response.data:
-                    raise Exception(f"Failed to create version for article {article_number}")
-                
-                version_id = version_response.data[0]['id']
-                
-                # Store for later processing
-                article_versions.append({
-                    'version_id': version_id,
-                    'article_id': article_id,
+                prepared.append({
                     'article_number': article_number,
+                    'clean_article_number': clean_article_number,
+                    'mandate_id': mandate_id,
                     'official_text': original_text,
+                    'effective_date': effective_date,
+                    'translations': translations,
                     'analysis_data': analysis
                 })
                 
-                if article_number == '0':
-                    logger.info(f"✅ Created preamble as article 0")
-                else:
-                    logger.info(f"✅ Created article {article_number} with version")
-                
             except Exception as e:
-                logger.error(f"❌ Error creating article {analysis.get('article_number', 'Unknown')}: {e}")
+                logger.error(f"❌ Error preparing article {analysis.get('article_number', 'Unknown')}: {e}")
                 continue
         
+        return prepared
+    
+    def _create_articles_with_preamble(self, law_id: str, prepared: List[Dict]) -> List[Dict]:
+        """Create articles and versions, one request per table (client-side fallback of create_law_with_articles)."""
+        if not prepared:
+            return []
+        
+        # Generate the article and version IDs up front so each version is tied to its article
+        # (and each result to its prepared item) without relying on RETURNING order
+        article_ids = [str(uuid.uuid4()) for _ in prepared]
+        version_ids = [str(uuid.uuid4()) for _ in prepared]
+        
+        articles_rows = [
+            {'id': article_id, 'law_id': law_id, 'article_number': item['clean_article_number']}
+            for item, article_id in zip(prepared, article_ids)
+        ]
+        article_response = self.supabase_admin.table('law_articles').insert(articles_rows).execute()
+        if not article_response.data or len(article_response.data) != len(prepared):
+            raise Exception(f"Failed to create articles for law {law_id}")
+        
+        versions_rows = [
+            {
+                'id': version_id,
+                'article_id': article_id,
+                'mandate_id': item['mandate_id'],
+                'status_id': 'ACTIVE',
+                'valid_from': item['effective_date'],
+                'official_text': item['official_text'],
+                'translations': item['translations']
+            }
+            for item, article_id, version_id in zip(prepared, article_ids, version_ids)
+        ]
+        version_response = self.supabase_admin.table('law_article_versions').insert(versions_rows).execute()
+        if not version_response.data or len(version_response.data) != len(prepared):
+            raise Exception(f"Failed to create article versions for law {law_id}")
+        
+        # Store for later processing
+        article_versions = [
+            {
+                'version_id': version_id,
+                'article_id': article_id,
+                'article_number': item['article_number'],
+                'official_text': item['official_text'],
+                'analysis_data': item['analysis_data']
+            }
+            for item, article_id, version_id in zip(prepared, article_ids, version_ids)
+        ]
+        
+        has_preamble = any(item['article_number'] == '0' for item in prepared)
+        logger.info(f"✅ Created {len(article_versions)} articles with versions{' (including preamble as article 0)' if has_preamble else ''}")
+        
         return article_versions
     
     def _perform_intelligent_tagging(self, article_versions: List[Dict]):
@@ -1120,6 +1562,9 @@ For each article in the input array, perform a detailed analysis following the s
         """
         logger.info(f"Performing intelligent tagging on {len(article_versions)} article versions")
         
+        # Collect every entity and (version, entity) link for the whole law first
+        entity_types = {}
+        links = []
         for article_version in article_versions:
             try:
                 analysis_data = article_version.get('analysis_data', {})
@@ -1138,105 +1583,181 @@ For each article in the input array, perform a detailed analysis following the s
                     if not entity_name:
                         continue
                     
-                    # UPSERT tag with type
-                    try:
-                        # Try to find existing tag
-                        existing_tag = self.supabase_admin.table('tags').select('*').eq('name', entity_name).execute()
-                        
-                        if existing_tag.data:
-                            # Update existing tag with type
-                            tag_id = existing_tag.data[0]['id']
-                            self.supabase_admin.table('tags').update({
-                                'type': entity_type
-                            }).eq('id', tag_id).execute()
-                        else:
-                            # Create new tag
-                            new_tag = self.supabase_admin.table('tags').insert({
-                                'name': entity_name,
-                                'type': entity_type,
-                                'translations': {
-                                    'pt': {'name': entity_name},
-                                    'en': {'name': entity_name}  # Could be enhanced
-                                }
-                            }).execute()
-                            tag_id = new_tag.data[0]['id']
-                        
-                        # Create tag link
-                        self.supabase_admin.table('law_article_version_tags').insert({
-                            'version_id': version_id,
-                            'tag_id': tag_id
-                        }).execute()
-                        
-                    except Exception as e:
-                        logger.warning(f"Tag creation/linking failed for {entity_name}: {e}")
+                    entity_types[entity_name] = entity_type  # Last occurrence wins, as with per-entity updates
+                    links.append({'version_id': version_id, 'name': entity_name})
                 
             except Exception as e:
                 logger.warning(f"Intelligent tagging error for article {article_version.get('article_number', 'Unknown')}: {e}")
+        
+        if not entity_types:
+            return
+        
+        entities = [{'name': name, 'type': entity_type} for name, entity_type in entity_types.items()]
+        
+        # Upsert all tags and links in a single round-trip
+        try:
+            response = self.supabase_admin.rpc('bulk_upsert_tags_and_links', {
+                'p_entities': entities,
+                'p_links': links
+            }).execute()
+            logger.info(f"🏷️ Upserted {len(entities)} tags, {response.data} new tag links")
+            return
+        except Exception as e:
+            logger.warning(f"⚠️ bulk_upsert_tags_and_links RPC unavailable, tagging client-side: {e}")
+        
+        self._tag_entities_client_side(entity_types, links)
     
-    def _perform_enhanced_relational_linking(self, article_versions: List[Dict]):
+    def _tag_entities_client_side(self, entity_types: Dict[str, str], links: List[Dict]):
+        """
+        Fallback for _perform_intelligent_tagging when the bulk RPC is not installed:
+        one lookup of the law's unique tag names, then bulk writes.
+        """
+        names = list(entity_types)
+        try:
+            # Look up every unique entity name of the law (chunked to bound the URL length)
+            name_to_id = {}
+            for start in range(0, len(names), self.TAG_LOOKUP_CHUNK_SIZE):
+                existing_tags = self.supabase_admin.table('tags').select('id, name').in_('name', names[start:start + self.TAG_LOOKUP_CHUNK_SIZE]).execute()
+                for tag in existing_tags.data or []:
+                    name_to_id.setdefault(tag['name'], tag['id'])
+            
+            # Update existing tags with their type, one request per distinct type
+            names_by_type = {}
+            for name in name_to_id:
+                names_by_type.setdefault(entity_types[name], []).append(name)
+            for entity_type, type_names in names_by_type.items():
+                self.supabase_admin.table('tags').update({'type': entity_type}).in_('name', type_names).execute()
+            
+            # Create the missing tags in one insert
+            new_tags = [
+                {
+                    'name': name,
+                    'type': entity_types[name],
+                    'translations': {
+                        'pt': {'name': name},
+                        'en': {'name': name}  # Could be enhanced
+                    }
+                }
+                for name in names if name not in name_to_id
+            ]
+            if new_tags:
+                inserted_tags = self.supabase_admin.table('tags').insert(new_tags).execute()
+                for tag in inserted_tags.data or []:
+                    name_to_id[tag['name']] = tag['id']
+            
+            # Create all tag links in one insert
+            link_rows = []
+            seen_links = set()
+            for link in links:
+                tag_id = name_to_id.get(link['name'])
+                if tag_id is None or (link['version_id'], tag_id) in seen_links:
+                    continue
+                seen_links.add((link['version_id'], tag_id))
+                link_rows.append({'version_id': link['version_id'], 'tag_id': tag_id})
+            if link_rows:
+                self.supabase_admin.table('law_article_version_tags').insert(link_rows).execute()
+            
+            logger.info(f"🏷️ Upserted {len(names)} tags ({len(new_tags)} new), {len(link_rows)} tag links")
+            
+        except Exception as e:
+            logger.warning(f"Tag creation/linking failed: {e}")
+    
+    def _perform_enhanced_relational_linking(self, article_versions: List[Dict], law_id: str):
         """
         Perform enhanced relational linking with status updates.
         Implements PROD5.md Part 4 enhanced relational logic.
         """
+        # Collect the cross-references of every article version up front
+        version_refs = []
+        ref_numbers = set()
         for article_version in article_versions:
+            analysis_data = article_version.get('analysis_data', {})
+            if 'analysis' not in analysis_data:
+                continue
+            
+            pt_analysis = analysis_data['analysis'].get('pt', {})
+            numbers = [ref.get('number', '') for ref in pt_analysis.get('cross_references', [])]
+            numbers = [number for number in numbers if number]
+            if numbers:
+                version_refs.append((article_version, numbers))
+                ref_numbers.update(numbers)
+        
+        if not ref_numbers:
+            return
+        
+        # Preload the source law and candidate target laws
+        try:
+            source_law_details = self.supabase_admin.table('laws').select('id, enactment_date').eq('id', law_id).execute()
+            if not source_law_details.data:
+                return
+            source_enactment = source_law_details.data[0]['enactment_date']
+            
+            candidate_laws = self._fetch_laws_matching_numbers(ref_numbers)
+        except Exception as e:
+            logger.warning(f"Enhanced relational linking lookup failed for law {law_id}: {e}")
+            return
+        
+        # Compile each reference pattern once and match it against the candidates in memory
+        ref_patterns = {number: re.compile(re.escape(number), re.IGNORECASE) for number in ref_numbers}
+        targets_by_number = {number: [] for number in ref_numbers}
+        for law in candidate_laws:
+            official_number = law.get('official_number') or ''
+            for number, pattern in ref_patterns.items():
+                if pattern.search(official_number):
+                    targets_by_number[number].append(law)
+        
+        # Accumulate one row per target law; the (target_law_id, source_law_id) primary key
+        # lets a single upsert skip relationships that already exist
+        relationships = []
+        linked_target_ids = set()
+        for article_version, numbers in version_refs:
             try:
-                analysis_data = article_version.get('analysis_data', {})
-                if 'analysis' not in analysis_data:
-                    continue
+                # Determine relationship type based on text analysis (once per version)
+                relationship_type = 'REVOKES' if _REVOKE_RE.search(article_version['official_text']) else 'AMENDS'
                 
-                pt_analysis = analysis_data['analysis'].get('pt', {})
-                cross_references = pt_analysis.get('cross_references', [])
-                
-                # Get source law info
-                source_law_response = self.supabase_admin.table('law_articles').select('law_id').eq('id', article_version['article_id']).execute()
-                if not source_law_response.data:
-                    continue
-                
-                source_law_id = source_law_response.data[0]['law_id']
-                source_law_details = self.supabase_admin.table('laws').select('id, enactment_date').eq('id', source_law_id).execute()
-                if not source_law_details.data:
-                    continue
-                
-                source_enactment = source_law_details.data[0]['enactment_date']
-                
-                for ref in cross_references:
-                    ref_number = ref.get('number', '')
-                    if ref_number:
-                        # Find target laws
-                        target_laws = self.supabase_admin.table('laws').select('id, enactment_date').ilike('official_number', f'%{ref_number}%').execute()
+                for ref_number in numbers:
+                    for target_law in targets_by_number.get(ref_number, []):
+                        target_enactment = target_law['enactment_date']
                         
-                        for target_law in target_laws.data or []:
-                            target_enactment = target_law['enactment_date']
+                        # Directional check: source law must be newer
+                        if source_enactment and target_enactment and source_enactment > target_enactment:
+                            if target_law['id'] in linked_target_ids:
+                                continue
+                            relationships.append({
+                                'source_law_id': law_id,
+                                'target_law_id': target_law['id'],
+                                'relationship_type': relationship_type
+                            })
+                            linked_target_ids.add(target_law['id'])
                             
-                            # Directional check: source law must be newer
-                            if source_enactment and target_enactment and source_enactment > target_enactment:
-                                try:
-                                    # Check if relationship already exists
-                                    existing_rel = self.supabase_admin.table('law_relationships').select('id').eq('source_law_id', source_law_id).eq('target_law_id', target_law['id']).execute()
-                                    
-                                    if not existing_rel.data:
-                                        # Determine relationship type based on text analysis
-                                        official_text = article_version['official_text'].lower()
-                                        if 'revog' in official_text or 'ab' in official_text:
-                                            relationship_type = 'REVOKES'
-                                        else:
-                                            relationship_type = 'AMENDS'
-                                        
-                                        # Create relationship
-                                        self.supabase_admin.table('law_relationships').insert({
-                                            'source_law_id': source_law_id,
-                                            'target_law_id': target_law['id'],
-                                            'relationship_type': relationship_type
-                                        }).execute()
-                                        
-                                        # TODO: Implement status updates for REVOKED articles
-                                        # This would update target article versions to SUPERSEDED status
-                                    
-                                except Exception as e:
-                                    logger.warning(f"Relationship creation failed: {e}")
+                            # TODO: Implement status updates for REVOKED articles
+                            # This would update target article versions to SUPERSEDED status
                             
             except Exception as e:
                 logger.warning(f"Enhanced relational linking error for article {article_version.get('article_number', 'Unknown')}: {e}")
+        
+        if not relationships:
+            return
+        
+        try:
+            self.supabase_admin.table('law_relationships').upsert(
+                relationships, on_conflict='target_law_id,source_law_id', ignore_duplicates=True
+            ).execute()
+            logger.info(f"🔗 Linked law {law_id} to {len(relationships)} related laws")
+        except Exception as e:
+            logger.warning(f"Relationship creation failed: {e}")
+    
+    def _fetch_laws_matching_numbers(self, ref_numbers) -> List[Dict]:
+        """Fetch laws whose official_number contains any of ref_numbers, a few OR-ed ilike filters per request."""
+        laws_by_id = {}
+        numbers = sorted(number for number in ref_numbers if '"' not in number)
+        for start in range(0, len(numbers), self.REF_LOOKUP_CHUNK_SIZE):
+            chunk = numbers[start:start + self.REF_LOOKUP_CHUNK_SIZE]
+            or_filter = ','.join(f'official_number.ilike."*{number}*"' for number in chunk)
+            response = self.supabase_admin.table('laws').select('id, enactment_date, official_number').or_(or_filter).execute()
+            for law in response.data or []:
+                laws_by_id[law['id']] = law
+        return list(laws_by_id.values())
     
     def _generate_law_level_summary(self, source_id: str, law_id: str, article_versions: List[Dict]):
         """
@@ -1245,52 +1766,36 @@ For each article in the input array, perform a detailed analysis following the s
         """
         logger.info("Generating law-level summary (reduce phase)")
         
-        # Collect all English summaries for token efficiency
-        english_summaries = []
-        for article_version in article_versions:
-            analysis_data = article_version.get('analysis_data', {})
-            if 'analysis' in analysis_data and 'en' in analysis_data['analysis']:
-                en_summary = analysis_data['analysis']['en'].get('informal_summary', '')
-                if en_summary and not en_summary.endswith('...'):
-                    english_summaries.append(en_summary)
-        
+        # Collect the distinct English summaries for token efficiency (formulaic articles repeat them)
+        all_summaries = list(_iter_english_summaries(article_versions))
+        english_summaries = list(dict.fromkeys(all_summaries))
         if not english_summaries:
             logger.warning("No English summaries found for law-level summary")
             return
+        if len(english_summaries) < len(all_summaries):
+            logger.info("Dropped %s duplicate article summaries (%s -> %s)",
+                        len(all_summaries) - len(english_summaries), len(all_summaries), len(english_summaries))
+        if sum(len(summary) for summary in english_summaries) < self.MIN_LAW_SUMMARY_INPUT_CHARS:
+            # Nothing for Gemini to reduce: the article summaries already are the law summary
+            self.supabase_admin.table('laws').update({
+                'translations': _concatenated_law_summary(article_versions)
+            }).eq('id', law_id).execute()
+            logger.info("✅ Short law: saved the article summaries as the law-level summary")
+            return
+        
+        # Bound the prompt size for long laws by merging the summaries in groups first
+        while len(english_summaries) > self.SUMMARY_REDUCE_GROUP_SIZE:
+            english_summaries = self._merge_summary_groups(english_summaries)
         
         # Create reduce prompt
         combined_summaries = '\n\n'.join(english_summaries)
         
-        reduce_prompt = f"""You are a legal expert tasked with creating a comprehensive law-level summary. Based on the individual article summaries below, create a high-level overview of the entire law.
-
-INDIVIDUAL ARTICLE SUMMARIES:
-{combined_summaries}
-
-YOUR TASK:
-Create a JSON object with both Portuguese and English summaries of the entire law:
-
-{{
-  "pt": {{
-    "informal_summary_title": "A concise title in Portuguese summarizing the entire law",
-    "informal_summary": "A comprehensive summary in Portuguese of what this law accomplishes overall"
-  }},
-  "en": {{
-    "informal_summary_title": "A concise title in English summarizing the entire law", 
-    "informal_summary": "A comprehensive summary in English of what this law accomplishes overall"
-  }}
-}}"""
+        reduce_prompt = _LAW_SUMMARY_PROMPT_TMPL.format(summaries=combined_summaries)
 
-        response = self._call_gemini(reduce_prompt)
+        response = self._call_gemini(reduce_prompt, validate=_parse_llm_json)
         
         try:
-            json_text = response.strip()
-            if json_text.startswith('```json'):
-                json_text = json_text[7:]
-            if json_text.endswith('```'):
-                json_text = json_text[:-3]
-            json_text = json_text.strip()
-            
-            law_summary = json.loads(json_text)
+            law_summary = _parse_llm_json(response)
             
             # Update the law record with translations
             self.supabase_admin.table('laws').update({
@@ -1300,17 +1805,90 @@ Create a JSON object with both Portuguese and English summaries of the entire la
             logger.info("✅ Law-level summary generated and saved")
             
         except (json.JSONDecodeError, ValueError) as e:
-            logger.error(f"Invalid JSON response from law summary generator: {e}")
+            logger.error("Invalid JSON response from law summary generator: %s", e)
+    
+    def _merge_summary_groups(self, summaries: List[str]) -> List[str]:
+        """Merge each group of SUMMARY_REDUCE_GROUP_SIZE summaries into one, concurrently."""
+        size = self.SUMMARY_REDUCE_GROUP_SIZE
+        groups = [summaries[start:start + size] for start in range(0, len(summaries), size)]
+        logger.info("Merging %s article summaries in %s groups", len(summaries), len(groups))
+        with ThreadPoolExecutor(max_workers=min(self.MAX_ANALYSIS_WORKERS, len(groups))) as executor:
+            return list(executor.map(self._merge_summary_group, groups))
+    
+    def _merge_summary_group(self, group: List[str]) -> str:
+        """Merge partial article summaries into a single English summary (falls back to joining them)."""
+        joined = '\n\n'.join(group)
+        merge_prompt = _SUMMARY_MERGE_PROMPT_TMPL.format(summaries=joined)
+        
+        response = self._call_gemini(merge_prompt).strip()
+        if not response or response == "{}":
+            return joined
+        return response
+    
+    def _call_gemini(self, prompt: str, validate: Optional[Callable[[str], object]] = None) -> str:
+        """
+        Call Gemini API with error handling. When USE_LLM_CACHE is on, an identical earlier prompt
+        reuses its response; a response is only cached if `validate` (e.g. the JSON parser) accepts it.
+        """
+        if not self.USE_LLM_CACHE:
+            return self._generate_with_retry(self.model, prompt)
+        
+        cached_response = _gemini_response_cache.get(prompt)
+        if cached_response is not None:
+            return cached_response
+        response = self._generate_with_retry(self.model, prompt)
+        if response == "{}":
+            return response
+        if validate is not None:
+            try:
+                validate(response)
+            except (json_utils.JSONDecodeError, ValueError):
+                return response
+        _gemini_response_cache.set(prompt, response)
+        return response
     
-    def _call_gemini(self, prompt: str) -> str:
-        """Call Gemini API with error handling."""
+    def _generate_with_retry(self, model, prompt: str) -> str:
+        """
+        Generate content, retrying transient errors with exponential backoff and jitter.
+        Returns "{}" on failure or while the circuit breaker is open.
+        """
+        if not self._gemini_breaker.allow():
+            logger.error("Gemini circuit breaker open, skipping API call")
+            return "{}"
+        
         try:
-            response = self.model.generate_content(prompt)
-            if response and response.text:
-                return response.text.strip()
-            else:
-                logger.error("Empty response from Gemini API")
-                return "{}"
+            response = generate_content_with_retry(
+                model, prompt, self.GEMINI_TIMEOUT_SECONDS, self.GEMINI_MAX_ATTEMPTS,
+                self.GEMINI_BACKOFF_BASE_SECONDS, self.GEMINI_BACKOFF_MAX_SECONDS,
+                on_transient_error=self._on_transient_gemini_error
+            )
+            text = response.text if response else None
+        except RATE_LIMIT_GEMINI_ERRORS as e:
+            # Throttled, not down: this still settles a half-open trial
+            self._gemini_breaker.record_success()
+            logger.error(f"Gemini rate limit persisted after retries: {e}")
+            return "{}"
+        except TRANSIENT_GEMINI_ERRORS as e:
+            logger.error(f"Gemini API error after retries: {e}")
+            return "{}"
         except Exception as e:
+            # Not an outage: the API answered, so this still settles a half-open trial
+            self._gemini_breaker.record_success()
             logger.error(f"Gemini API error: {e}")
-            return "{}"
\ No newline at end of file
+            return "{}"
+        
+        self._gemini_breaker.record_success()
+        if text:
+            return text.strip()
+        logger.error("Empty response from Gemini API")
+        return "{}"
+    
+    def _on_transient_gemini_error(self, error: Exception) -> bool:
+        """
+        Count a transient error against the circuit breaker and keep retrying only while it allows calls.
+        Rate limits just back off and retry: a burst of 429s across the workers is not an outage.
+        """
+        if isinstance(error, RATE_LIMIT_GEMINI_ERRORS):
+            return True
+        self._gemini_breaker.record_failure()
+        return self._gemini_breaker.allow()
@@ -9,7 +9,6 @@ This analyzer implements the final, definitive refactor:
 - Final summary synthesis with category suggestions
 """
 
-import json
 import logging
 import os
 import re
@@ -19,6 +18,7 @@ from datetime import datetime, date
 
 from dotenv import load_dotenv
 import google.generativeai as genai
+from lib import json_utils
 from lib.supabase_client import get_supabase_client, get_supabase_admin_client
 
 load_dotenv()
@@ -122,12 +122,9 @@ class KritisAnalyzerV40:
             metadata_text = response.text.strip()
             
             # Clean the response to ensure it's valid JSON
-            if metadata_text.startswith('```json'):
-                metadata_text = metadata_text[7:]
-            if metadata_text.endswith('```'):
-                metadata_text = metadata_text[:-3]
+            metadata_text = json_utils.extract_json_text(metadata_text)
             
-            metadata = json.loads(metadata_text)
+            metadata = json_utils.loads(metadata_text)
             
             # Ensure government_entity_id is set
             metadata['government_entity_id'] = "3ee8d3ef-7226-4bf3-8ea2-6e2e036d203f"
@@ -182,18 +179,10 @@ class KritisAnalyzerV40:
             extraction_text = response.text.strip()
             
             # Clean the response to ensure it's valid JSON
-            if extraction_text.startswith('```json'):
-                extraction_text = extraction_text[7:]
-            if extraction_text.endswith('```'):
-                extraction_text = extraction_text[:-3]
-            
-            # Additional cleaning - remove any markdown formatting
-            extraction_text = re.sub(r'^```.*?\n', '', extraction_text, flags=re.MULTILINE)
-            extraction_text = re.sub(r'\n```$', '', extraction_text)
-            extraction_text = extraction_text.strip()
+            extraction_text = json_utils.extract_json_text(extraction_text)
             
             logger.info(f"🔍 Attempting to parse extraction JSON (length: {len(extraction_text)} chars)")
-            result = json.loads(extraction_text)
+            result = json_utils.loads(extraction_text)
             
             # Validate the structure
             if 'preamble_text' not in result:
@@ -203,7 +192,7 @@ class KritisAnalyzerV40:
             
             return result
             
-        except json.JSONDecodeError as e:
+        except json_utils.JSONDecodeError as e:
             logger.error(f"❌ JSON parsing failed: {e}")
             logger.error(f"Raw response (first 500 chars): {extraction_text[:500] if 'extraction_text' in locals() else 'No response'}")
             # Fallback: return empty structure
@@ -368,12 +357,9 @@ Return a single, valid JSON object with the following structure. Do not add any
             analysis_text = response.text.strip()
             
             # Clean the response to ensure it's valid JSON
-            if analysis_text.startswith('```json'):
-                analysis_text = analysis_text[7:]
-            if analysis_text.endswith('```'):
-                analysis_text = analysis_text[:-3]
+            analysis_text = json_utils.extract_json_text(analysis_text)
             
-            analysis = json.loads(analysis_text)
+            analysis = json_utils.loads(analysis_text)
             
             # Validate and normalize the structure
             if 'tags' not in analysis:
@@ -531,12 +517,9 @@ Synthesize the provided summaries into a single, high-level overview of the enti
             synthesis_text = response.text.strip()
             
             # Clean the response to ensure it's valid JSON
-            if synthesis_text.startswith('```json'):
-                synthesis_text = synthesis_text[7:]
-            if synthesis_text.endswith('```'):
-                synthesis_text = synthesis_text[:-3]
+            synthesis_text = json_utils.extract_json_text(synthesis_text)
             
-            synthesis = json.loads(synthesis_text)
+            synthesis = json_utils.loads(synthesis_text)
             
             # Validate category suggestion
             suggested_category = synthesis.get('suggested_category_id')
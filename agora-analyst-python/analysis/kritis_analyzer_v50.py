@@ -10,7 +10,6 @@ This analyzer implements relationship consistency improvements:
 - Updates article status when superseded or revoked
 """
 
-import json
 import logging
 import os
 import re
@@ -21,6 +20,7 @@ from datetime import datetime, date, timedelta
 
 from dotenv import load_dotenv
 import google.generativeai as genai
+from lib import json_utils
 from lib.supabase_client import get_supabase_client, get_supabase_admin_client
 
 load_dotenv()
@@ -152,12 +152,9 @@ DOCUMENT:
             extraction_text = response.text.strip()
             
             # Clean response
-            if extraction_text.startswith('```json'):
-                extraction_text = extraction_text[7:]
-            if extraction_text.endswith('```'):
-                extraction_text = extraction_text[:-3]
+            extraction_text = json_utils.extract_json_text(extraction_text)
             
-            result = json.loads(extraction_text)
+            result = json_utils.loads(extraction_text)
             
             # Validate structure
             if 'preamble_text' not in result:
@@ -339,12 +336,9 @@ Return one valid JSON object only, with this EXACT structure:
             logger.info("="*80)
             
             # Clean response
-            if analysis_text.startswith('```json'):
-                analysis_text = analysis_text[7:]
-            if analysis_text.endswith('```'):
-                analysis_text = analysis_text[:-3]
+            analysis_text = json_utils.extract_json_text(analysis_text)
             
-            analysis = json.loads(analysis_text)
+            analysis = json_utils.loads(analysis_text)
             
             # LOG PARSED ANALYSIS
             logger.info("📊 PARSED ANALYSIS STRUCTURE:")
@@ -1399,7 +1393,7 @@ Return ONLY a JSON object with this exact structure, no additional text:
 }}
 
 Portuguese tags to translate:
-{json.dumps(tags_pt, ensure_ascii=False, indent=2)}
+{json_utils.dumps(tags_pt, indent=True)}
 """
         
         try:
@@ -1407,12 +1401,9 @@ Portuguese tags to translate:
             response_text = response.text.strip()
             
             # Clean response
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
+            response_text = json_utils.extract_json_text(response_text)
             
-            tags_en = json.loads(response_text)
+            tags_en = json_utils.loads(response_text)
             return tags_en
             
         except Exception as e:
@@ -1473,12 +1464,9 @@ Return ONLY a JSON object with this exact structure:
             response_text = response.text.strip()
             
             # Clean response
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
+            response_text = json_utils.extract_json_text(response_text)
             
-            comprehensive = json.loads(response_text)
+            comprehensive = json_utils.loads(response_text)
             
             # Validate structure
             if comprehensive.get('pt') and comprehensive.get('en'):
@@ -9,17 +9,20 @@ Key improvements in V6.0:
 - Multilingual tag aggregation with proper noun preservation
 """
 
-import json
 import logging
 import os
 import re
+import time
 import uuid
 import unicodedata
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, List, Any, Optional
 from datetime import datetime, date, timedelta
 
 from dotenv import load_dotenv
 import google.generativeai as genai
+from lib import json_utils
+from lib.gemini_retry import generate_content_with_retry
 from lib.supabase_client import get_supabase_client, get_supabase_admin_client
 from lib.translator import translate_text, translate_analysis_object, translate_tags
 
@@ -29,6 +32,15 @@ logger = logging.getLogger(__name__)
 class KritisAnalyzerV6:
     """Kritis V6.0 - Production Analyst with efficiency and cost optimizations."""
 
+    # Concurrent Gemini requests for independent reduce sub-calls (bounded by the API rate limit)
+    GEMINI_MAX_CONCURRENCY = int(os.getenv('GEMINI_MAX_CONCURRENCY', '8'))
+
+    # Per-request timeout and jittered exponential backoff for transient Gemini errors
+    GEMINI_TIMEOUT_SECONDS = float(os.getenv('KRITIS_GEMINI_TIMEOUT_SECONDS', '300'))
+    GEMINI_MAX_ATTEMPTS = int(os.getenv('KRITIS_GEMINI_MAX_ATTEMPTS', '5'))
+    GEMINI_BACKOFF_BASE_SECONDS = float(os.getenv('KRITIS_GEMINI_BACKOFF_BASE_SECONDS', '1'))
+    GEMINI_BACKOFF_MAX_SECONDS = float(os.getenv('KRITIS_GEMINI_BACKOFF_MAX_SECONDS', '30'))
+
     def __init__(self):
         """Initialize Kritis V6.0 with Supabase clients and Gemini AI."""
         self.supabase = get_supabase_client()
@@ -49,6 +61,16 @@ class KritisAnalyzerV6:
             'JUDICIAL', 'ADMINISTRATIVE', 'CIVIL', 'CRIMINAL', 'SOCIAL_SECURITY'
         ]
     
+    def _generate_content(self, prompt: str):
+        """
+        Call Gemini with a request timeout, retrying transient errors with jittered
+        exponential backoff. Re-raises the last error once attempts are exhausted.
+        """
+        return generate_content_with_retry(
+            self.model, prompt, self.GEMINI_TIMEOUT_SECONDS, self.GEMINI_MAX_ATTEMPTS,
+            self.GEMINI_BACKOFF_BASE_SECONDS, self.GEMINI_BACKOFF_MAX_SECONDS
+        )
+    
     # ========================================
     # STAGE 1: ENHANCED EXTRACTOR (unchanged from v5.0)
     # ========================================
@@ -151,16 +173,13 @@ DOCUMENT:
 """
         
         try:
-            response = self.model.generate_content(extraction_prompt)
+            response = self._generate_content(extraction_prompt)
             extraction_text = response.text.strip()
             
             # Clean response
-            if extraction_text.startswith('```json'):
-                extraction_text = extraction_text[7:]
-            if extraction_text.endswith('```'):
-                extraction_text = extraction_text[:-3]
+            extraction_text = json_utils.extract_json_text(extraction_text)
             
-            result = json.loads(extraction_text)
+            result = json_utils.loads(extraction_text)
             
             # Validate structure
             if 'preamble_text' not in result:
@@ -265,8 +284,6 @@ DOCUMENT:
         """
         Wrapper for _analyze_content_v6_map with exponential backoff for rate limit errors.
         """
-        import time
-        
         for attempt in range(max_retries):
             try:
                 return self._analyze_content_v6_map(content, content_type, article_number)
@@ -363,16 +380,13 @@ Retorna um único objeto JSON válido com esta estrutura EXATA:
 """
         
         try:
-            response = self.model.generate_content(analysis_prompt)
+            response = self.model.generate_content(analysis_prompt, request_options={'timeout': self.GEMINI_TIMEOUT_SECONDS})
             analysis_text = response.text.strip()
             
             # Clean response
-            if analysis_text.startswith('```json'):
-                analysis_text = analysis_text[7:]
-            if analysis_text.endswith('```'):
-                analysis_text = analysis_text[:-3]
+            analysis_text = json_utils.extract_json_text(analysis_text)
             
-            analysis = json.loads(analysis_text)
+            analysis = json_utils.loads(analysis_text)
             
             # Validate structure
             if 'tags' not in analysis:
@@ -1021,21 +1035,18 @@ Retorna um único objeto JSON válido:
 """
         
         try:
-            response = self.model.generate_content(reduce_prompt)
+            response = self._generate_content(reduce_prompt)
             response_text = response.text.strip()
             
             # Clean response
-            if response_text.startswith('```json'):
-                response_text = response_text[7:]
-            if response_text.endswith('```'):
-                response_text = response_text[:-3]
+            response_text = json_utils.extract_json_text(response_text)
             
             # Remove literal control characters that break JSON parsing
             # These can appear in AI-generated summaries
             import re
             response_text = re.sub(r'[\x00-\x1f\x7f]', ' ', response_text)
             
-            result = json.loads(response_text)
+            result = json_utils.loads(response_text)
             
             # Extract final_analysis if nested
             if 'final_analysis' in result:
@@ -1056,25 +1067,10 @@ Retorna um único objeto JSON válido:
         
         logger.info(f"📦 Split into {len(batches)} batches")
         
-        # Pre-summarize each batch
-        pre_summaries = []
-        for i, batch in enumerate(batches):
-            logger.info(f"🔄 Pre-summarizing batch {i+1}/{len(batches)}...")
-            batch_text = "\n\n".join(batch)
-            
-            pre_prompt = f"""
-Sintetiza estes artigos de lei num resumo conciso (1-2 parágrafos):
-
-{batch_text}
-
-Retorna apenas o texto do resumo, sem JSON.
-"""
-            try:
-                response = self.model.generate_content(pre_prompt)
-                pre_summary = response.text.strip()
-                pre_summaries.append(f"Lote {i+1}: {pre_summary}")
-            except Exception as e:
-                logger.error(f"❌ Batch {i+1} pre-summarization failed: {e}")
+        # Pre-summarize the batches concurrently (independent, network-bound Gemini calls)
+        with ThreadPoolExecutor(max_workers=min(self.GEMINI_MAX_CONCURRENCY, len(batches))) as executor:
+            results = executor.map(self._pre_summarize_batch, range(1, len(batches) + 1), batches)
+            pre_summaries = [pre_summary for pre_summary in results if pre_summary]
         
         # Final Reduce on pre-summaries
         if pre_summaries:
@@ -1083,3 +1079,23 @@ Retorna apenas o texto do resumo, sem JSON.
             return self._run_reduce_prompt_v6(combined_pre_summaries)
         
         return None
+    
+    def _pre_summarize_batch(self, batch_number: int, batch: List[str]) -> Optional[str]:
+        """Pre-summarize one batch of article summaries for the batched Reduce."""
+        logger.info(f"🔄 Pre-summarizing batch {batch_number}...")
+        batch_text = "\n\n".join(batch)
+        
+        pre_prompt = f"""
+Sintetiza estes artigos de lei num resumo conciso (1-2 parágrafos):
+
+{batch_text}
+
+Retorna apenas o texto do resumo, sem JSON.
+"""
+        try:
+            response = self._generate_content(pre_prompt)
+            pre_summary = response.text.strip()
+            return f"Lote {batch_number}: {pre_summary}"
+        except Exception as e:
+            logger.error(f"❌ Batch {batch_number} pre-summarization failed: {e}")
+            return None
@@ -1,5 +1,5 @@
 """Check the constitution source and law records."""
-import json
+from lib import json_utils
 from lib.supabase_client import get_supabase_admin_client
 
 supabase = get_supabase_admin_client()
@@ -16,7 +16,7 @@ if source_response.data:
     print(f"Type ID: {source['type_id']}")
     print(f"Created: {source['created_at']}")
     print(f"\nTranslations:")
-    print(json.dumps(source['translations'], indent=2))
+    print(json_utils.dumps(source['translations'], indent=True))
 else:
     print("Source not found")
 
@@ -32,7 +32,7 @@ if law_response.data:
         print(f"Official Title: {law['official_title']}")
         print(f"Type ID: {law['type_id']}")
         print(f"Enactment Date: {law['enactment_date']}")
-        print(f"Translations: {json.dumps(law.get('translations'), indent=2)}")
+        print(f"Translations: {json_utils.dumps(law.get('translations'), indent=True)}")
 else:
     print("Law not found")
 
@@ -1,5 +1,5 @@
 """Check the created law and its articles for issues."""
-import json
+from lib import json_utils
 from lib.supabase_client import get_supabase_admin_client
 
 supabase = get_supabase_admin_client()
@@ -17,7 +17,7 @@ if law_response.data:
     print(f"Type ID: {law['type_id']}")
     print(f"Category ID: {law['category_id']}")
     print(f"Enactment Date: {law['enactment_date']}")
-    print(f"Tags: {json.dumps(law['tags'], indent=2)}")
+    print(f"Tags: {json_utils.dumps(law['tags'], indent=True)}")
 
 print("\n" + "=" * 80)
 print("LAW ARTICLES:")
@@ -29,7 +29,7 @@ if articles_response.data:
         print(f"  ID: {article['id']}")
         print(f"  Valid From: {article['valid_from']}")
         print(f"  Has Tags: {bool(article.get('tags'))}")
-        print(f"  Tags: {json.dumps(article.get('tags', {}), indent=4)}")
+        print(f"  Tags: {json_utils.dumps(article.get('tags', {}), indent=True)}")
         
         translations = article.get('translations', {})
         print(f"  Has Translations: {bool(translations)}")
@@ -1,5 +1,5 @@
 """Check the source translations structure."""
-import json
+from lib import json_utils
 from lib.supabase_client import get_supabase_admin_client
 
 supabase = get_supabase_admin_client()
@@ -15,7 +15,7 @@ if source_response.data:
     print(f"Slug: {source['slug']}")
     print(f"Type ID: {source['type_id']}")
     print(f"\nTranslations:")
-    print(json.dumps(source['translations'], indent=2))
+    print(json_utils.dumps(source['translations'], indent=True))
     
     # Check the structure
     translations = source['translations']
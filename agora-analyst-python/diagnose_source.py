@@ -1,5 +1,5 @@
 """Diagnostic script to inspect source data for official_number extraction."""
-import json
+from lib import json_utils
 from lib.supabase_client import get_supabase_admin_client
 
 supabase = get_supabase_admin_client()
@@ -15,7 +15,7 @@ if source_response.data:
     print(f"Type ID: {source['type_id']}")
     print(f"Published At: {source['published_at']}")
     print(f"\nTranslations:")
-    print(json.dumps(source['translations'], indent=2))
+    print(json_utils.dumps(source['translations'], indent=True))
 
 # Check last chunk
 print("\n" + "=" * 80)
@@ -46,4 +46,4 @@ if extraction_response.data:
     extracted_data = extraction_response.data[0]['extracted_data']
     metadata = extracted_data.get('metadata', {})
     print(f"Metadata:")
-    print(json.dumps(metadata, indent=2))
+    print(json_utils.dumps(metadata, indent=True))
@@ -0,0 +1,35 @@
+"""
+Process-wide configuration for Agora Analyst.
+Required environment variables are read once (after loading .env) into a frozen CONFIG.
+"""
+
+import os
+from dataclasses import dataclass, fields
+from typing import List, Optional
+
+from dotenv import load_dotenv
+
+# Load environment variables
+load_dotenv()
+
+
+@dataclass(frozen=True)
+class Config:
+    """Required service credentials; each field maps to the upper-cased environment variable."""
+
+    supabase_url: Optional[str]
+    supabase_service_role_key: Optional[str]
+    supabase_anon_key: Optional[str]
+    gemini_api_key: Optional[str]
+
+    @classmethod
+    def from_env(cls) -> 'Config':
+        """Build the configuration from the current environment."""
+        return cls(**{field.name: os.getenv(field.name.upper()) for field in fields(cls)})
+
+    def missing(self) -> List[str]:
+        """Return the names of the required environment variables that are unset or empty."""
+        return [field.name.upper() for field in fields(self) if not getattr(self, field.name)]
+
+
+CONFIG = Config.from_env()
@@ -0,0 +1,61 @@
+"""
+Gemini request retries for Agora Analyst.
+Shared by the Kritis analyzers: a per-request timeout plus jittered exponential backoff
+for transient errors (rate limits, 5xx, timeouts).
+"""
+
+import logging
+import random
+import time
+from typing import Callable, Optional
+
+from google.api_core import exceptions as google_exceptions
+
+logger = logging.getLogger(__name__)
+
+# Gemini errors worth retrying the same request for (rate limits, 5xx, timeouts)
+TRANSIENT_GEMINI_ERRORS = (
+    google_exceptions.ResourceExhausted,
+    google_exceptions.ServiceUnavailable,
+    google_exceptions.InternalServerError,
+    google_exceptions.DeadlineExceeded,
+)
+
+# Rate limiting: the API is up but throttling us, so callers should back off rather than treat it as an outage
+RATE_LIMIT_GEMINI_ERRORS = (google_exceptions.ResourceExhausted,)
+
+
+def generate_content_with_retry(model, prompt: str, timeout_seconds: float, max_attempts: int,
+                                backoff_base_seconds: float, backoff_max_seconds: float,
+                                on_transient_error: Optional[Callable[[Exception], bool]] = None):
+    """
+    Call model.generate_content with a request timeout, retrying transient errors with
+    full-jitter exponential backoff.
+
+    Args:
+        model: Gemini GenerativeModel
+        prompt: Prompt to send
+        timeout_seconds: Per-request timeout
+        max_attempts: Total attempts, including the first
+        backoff_base_seconds: Backoff cap for the first retry, doubled per attempt
+        backoff_max_seconds: Upper bound on any single backoff
+        on_transient_error: Called with each transient error; returning False stops retrying
+
+    Returns:
+        The Gemini response
+
+    Raises:
+        The last transient error once attempts are exhausted (or on_transient_error stops
+        retrying); any other error immediately.
+    """
+    for attempt in range(max_attempts):
+        try:
+            return model.generate_content(prompt, request_options={'timeout': timeout_seconds})
+        except TRANSIENT_GEMINI_ERRORS as e:
+            if on_transient_error is not None and not on_transient_error(e):
+                raise
+            if attempt == max_attempts - 1:
+                raise
+            delay = random.uniform(0, min(backoff_max_seconds, backoff_base_seconds * 2 ** attempt))
+            logger.warning(f"⚠️ Transient Gemini error, retrying in {delay:.1f}s (attempt {attempt + 1}/{max_attempts}): {e}")
+            time.sleep(delay)
@@ -0,0 +1,59 @@
+"""
+Fast JSON helpers for Agora Analyst.
+Uses orjson when available with graceful fallback to the standard library.
+"""
+
+import json
+import re
+from typing import Any, Union
+
+# Check orjson availability
+orjson_available = False
+try:
+    import orjson
+    orjson_available = True
+except ImportError:
+    orjson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can keep
+# catching the stdlib exception regardless of the backend in use
+JSONDecodeError = json.JSONDecodeError
+
+# LLM output wrappers: an outer ``` fence (any language tag) or prose around the outermost object/array.
+# The fence body is greedy and anchored so ``` inside JSON strings doesn't end it early.
+_FENCE_RE = re.compile(r'^\s*```[a-z]*\s*(.*)```\s*$', re.DOTALL | re.IGNORECASE)
+_JSON_VALUE_RE = re.compile(r'[\[{].*[\]}]', re.DOTALL)
+
+
+def loads(data: Union[str, bytes]) -> Any:
+    """Deserialize a JSON document (str or bytes)."""
+    if orjson_available:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def dumps(obj: Any, indent: bool = False) -> str:
+    """
+    Serialize obj to a JSON string.
+
+    Args:
+        obj: Object to serialize
+        indent: Pretty-print with 2-space indentation
+
+    Returns:
+        JSON text (non-ASCII characters are kept as-is)
+    """
+    if orjson_available:
+        # OPT_NON_STR_KEYS: accept int/etc. dict keys like json.dumps does
+        option = orjson.OPT_NON_STR_KEYS | (orjson.OPT_INDENT_2 if indent else 0)
+        return orjson.dumps(obj, option=option).decode('utf-8')
+    return json.dumps(obj, indent=2 if indent else None, ensure_ascii=False)
+
+
+def extract_json_text(text: str) -> str:
+    """Return the JSON payload of an LLM response, unwrapping a ``` fence or surrounding prose."""
+    match = _FENCE_RE.match(text)
+    if match:
+        return match.group(1).strip()
+    match = _JSON_VALUE_RE.search(text)
+    return match.group(0) if match else text.strip()
@@ -0,0 +1,107 @@
+"""
+Exact-match cache for LLM responses in Agora Analyst.
+Responses are keyed by the SHA-256 of the prompt and kept in a process-level
+LRU, optionally backed by a directory so repeated runs can reuse them.
+"""
+
+import hashlib
+import logging
+import os
+import tempfile
+import threading
+import time
+from collections import OrderedDict
+from typing import Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+
+class LLMResponseCache:
+    """Thread-safe LRU+TTL cache of LLM responses with an optional on-disk layer."""
+
+    def __init__(self, max_entries: int = 256, ttl_seconds: int = 86400, directory: Optional[str] = None):
+        """
+        Args:
+            max_entries: Maximum responses kept in memory
+            ttl_seconds: Age after which a cached response is ignored
+            directory: Optional directory where responses are also persisted
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.directory = directory
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def key(prompt: str) -> str:
+        """Return the cache key for prompt."""
+        return hashlib.sha256(prompt.encode('utf-8')).hexdigest()
+
+    def get(self, prompt: str) -> Optional[str]:
+        """Return the cached response for prompt, or None if missing/expired."""
+        key = self.key(prompt)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                if time.time() - entry[0] <= self.ttl_seconds:
+                    self._entries.move_to_end(key)
+                    self.hits += 1
+                    return entry[1]
+                del self._entries[key]
+
+        response = self._read_file(key)
+        with self._lock:
+            if response is None:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._store(key, time.time(), response)
+        return response
+
+    def set(self, prompt: str, response: str):
+        """Cache response for prompt, evicting the least recently used entry when full."""
+        key = self.key(prompt)
+        with self._lock:
+            self._store(key, time.time(), response)
+        self._write_file(key, response)
+
+    def log_stats(self, label: str = "LLM"):
+        """Log the hit/miss counters."""
+        total = self.hits + self.misses
+        if total:
+            logger.info(f"🗄️ {label} response cache: {self.hits} hits, {self.misses} misses ({self.hits / total:.0%} hit rate)")
+
+    def _store(self, key: str, stored_at: float, response: str):
+        self._entries[key] = (stored_at, response)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.txt")
+
+    def _read_file(self, key: str) -> Optional[str]:
+        if not self.directory:
+            return None
+        try:
+            path = self._path(key)
+            if time.time() - os.path.getmtime(path) > self.ttl_seconds:
+                return None
+            with open(path, 'r', encoding='utf-8') as cache_file:
+                return cache_file.read()
+        except OSError:
+            return None
+
+    def _write_file(self, key: str, response: str):
+        if not self.directory:
+            return
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            # Write atomically so concurrent workers never read a partial file
+            with tempfile.NamedTemporaryFile('w', dir=self.directory, delete=False, encoding='utf-8') as tmp_file:
+                tmp_file.write(response)
+            os.replace(tmp_file.name, self._path(key))
+        except OSError as e:
+            logger.warning(f"⚠️ Could not write LLM cache entry {key}: {e}")
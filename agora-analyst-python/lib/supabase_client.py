@@ -3,47 +3,89 @@ Supabase client configuration for Agora Analyst.
 """
 
 import os
+from functools import lru_cache
+import httpx
 from supabase import create_client, Client
 from supabase.lib.client_options import SyncClientOptions
-from dotenv import load_dotenv
+from lib.config import CONFIG
 
-# Load environment variables
-load_dotenv()
+# Check h2 availability (HTTP/2 multiplexes concurrent PostgREST requests over one connection)
+h2_available = False
+try:
+    import h2  # noqa: F401
+    h2_available = True
+except ImportError:
+    pass
 
+# Keep-alive pool sized for the analyzers' concurrent Gemini/Supabase workers
+_HTTP_LIMITS = httpx.Limits(
+    max_connections=int(os.getenv('SUPABASE_MAX_CONNECTIONS', '20')),
+    max_keepalive_connections=int(os.getenv('SUPABASE_MAX_KEEPALIVE_CONNECTIONS', '20')),
+    keepalive_expiry=300
+)
+_HTTP_TIMEOUT = 120
+
+# PostgREST / Postgres error codes for an RPC whose function is not deployed
+_MISSING_FUNCTION_CODES = frozenset({'PGRST202', '42883'})
+
+
+def is_missing_function_error(error: Exception) -> bool:
+    """Return whether error means the called RPC function does not exist, so a client-side fallback is safe."""
+    return getattr(error, 'code', None) in _MISSING_FUNCTION_CODES
+
+
+def _client_options() -> SyncClientOptions:
+    """
+    Build client options with a persistent, pooled HTTP client.
+
+    Each Supabase client gets its own httpx.Client because PostgREST sets the
+    base URL and auth headers on it.
+    """
+    http_client = httpx.Client(limits=_HTTP_LIMITS, timeout=_HTTP_TIMEOUT, http2=h2_available)
+    return SyncClientOptions(schema='agora', httpx_client=http_client)
+
+@lru_cache(maxsize=None)
 def get_supabase_client() -> Client:
     """
     Create and return a Supabase client instance.
 
+    The client is cached and backed by a keep-alive connection pool, so
+    TCP/TLS connections are reused across queries.
+
     Returns:
         Client: Configured Supabase client
 
     Raises:
         ValueError: If required environment variables are missing
     """
-    url = os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_ANON_KEY')
+    url = CONFIG.supabase_url
+    key = CONFIG.supabase_anon_key
 
     if not url or not key:
         raise ValueError("SUPABASE_URL and SUPABASE_ANON_KEY must be set in environment variables")
 
-    options = SyncClientOptions(schema='agora')
+    options = _client_options()
     return create_client(url, key, options=options)
 
+@lru_cache(maxsize=None)
 def get_supabase_admin_client() -> Client:
     """
     Create and return a Supabase client with admin privileges for data operations.
 
+    The client is cached and backed by a keep-alive connection pool, so
+    TCP/TLS connections are reused across queries.
+
     Returns:
         Client: Configured Supabase admin client
 
     Raises:
         ValueError: If required environment variables are missing
     """
-    url = os.getenv('SUPABASE_URL')
-    key = os.getenv('SUPABASE_SERVICE_ROLE_KEY')
+    url = CONFIG.supabase_url
+    key = CONFIG.supabase_service_role_key
 
     if not url or not key:
         raise ValueError("SUPABASE_URL and SUPABASE_SERVICE_ROLE_KEY must be set in environment variables")
 
-    options = SyncClientOptions(schema='agora')
+    options = _client_options()
     return create_client(url, key, options=options)
\ No newline at end of file
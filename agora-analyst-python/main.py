@@ -11,12 +11,12 @@ import argparse
 import logging
 import sys
 import os
-import uuid
-from datetime import datetime
-from analysis.kritis_analyzer_v40 import KritisAnalyzerV40
-from analysis.kritis_analyzer_v50 import KritisAnalyzerV50
-from analysis.kritis_analyzer_v6 import KritisAnalyzerV6
-from lib.supabase_client import get_supabase_admin_client
+import re
+from functools import lru_cache
+from lib import json_utils
+
+# The analyzers and Supabase client are imported where they are first needed, so
+# describe-workflows and --help skip loading google-generativeai and supabase
 
 # Configure logging
 log_level = os.getenv('LOG_LEVEL', 'INFO').upper()
@@ -28,30 +28,38 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+# Canonical 8-4-4-4-12 hex UUID, as stored for sources and jobs
+_UUID_RE = re.compile(r'[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}')
+
+@lru_cache(maxsize=1)
+def _v40():
+    """Return the process-wide Kritis V4.0 analyzer (built once, reused by every stage)."""
+    from analysis.kritis_analyzer_v40 import KritisAnalyzerV40
+    return KritisAnalyzerV40()
+
+@lru_cache(maxsize=1)
+def _v50():
+    """Return the process-wide Kritis V5.0 analyzer (built once, reused by every stage)."""
+    from analysis.kritis_analyzer_v50 import KritisAnalyzerV50
+    return KritisAnalyzerV50()
+
+@lru_cache(maxsize=1)
+def _v6():
+    """Return the process-wide Kritis V6.0 analyzer (built once, reused by every stage)."""
+    from analysis.kritis_analyzer_v6 import KritisAnalyzerV6
+    return KritisAnalyzerV6()
+
 def validate_uuid(source_id: str) -> bool:
     """Validate that source_id is a proper UUID format."""
-    try:
-        uuid.UUID(source_id)
-        return True
-    except ValueError:
-        return False
+    return bool(source_id and _UUID_RE.fullmatch(source_id))
 
 def validate_environment() -> bool:
     """Validate that all required environment variables are set."""
-    required_vars = [
-        'SUPABASE_URL',
-        'SUPABASE_SERVICE_ROLE_KEY',
-        'SUPABASE_ANON_KEY',
-        'GEMINI_API_KEY'
-    ]
-    
-    missing_vars = []
-    for var in required_vars:
-        if not os.getenv(var):
-            missing_vars.append(var)
+    from lib.config import CONFIG
+    missing_vars = CONFIG.missing()
     
     if missing_vars:
-        logger.error(f"❌ Missing required environment variables: {', '.join(missing_vars)}")
+        logger.error("❌ Missing required environment variables: %s", ', '.join(missing_vars))
         return False
     
     logger.info("✅ Environment validation passed")
@@ -73,20 +81,395 @@ def update_job_status(job_id: str | None, status: str, result_message: str) -> N
         return
     
     try:
-        logger.info(f"📝 Updating job {job_id} to status: {status}")
+        logger.info("📝 Updating job %s to status: %s", job_id, status)
+        from lib.supabase_client import get_supabase_admin_client
         supabase = get_supabase_admin_client()
         
+        # updated_at is set server-side by the set_updated_at trigger
         supabase.table("background_jobs").update({
             "status": status,
-            "result_message": result_message,
-            "updated_at": datetime.now().isoformat()  # Use timezone-aware datetime
+            "result_message": result_message
         }).eq("id", job_id).execute()
         
-        logger.info(f"✅ Job status updated successfully")
+        logger.info("✅ Job status updated successfully")
     except Exception as e:
-        logger.warning(f"⚠️ Failed to update job status (non-critical): {e}")
+        logger.warning("⚠️ Failed to update job status (non-critical): %s", e)
         # Don't raise - job notifications are optional and should never break the analysis
 
+# ========================================
+# KRITIS V4.0 COMMANDS (PROD10)
+# ========================================
+
+def _handle_v40_extract(args):
+    """Kritis V4.0 Stage 1: PROD10 Enhanced Extractor"""
+    logger.info("🚀 Using Kritis V4.0 PROD10 Pipeline")
+    kritis_v40 = _v40()
+    result = kritis_v40.run_enhanced_extractor_phase(args.source_id)
+    logger.info("🎯 Kritis V4.0 Stage 1 completed successfully")
+    logger.info("📄 PROD10 Extraction Results:")
+    logger.info("Total Articles Found: %s", result['total_articles'])
+    logger.info("Has Preamble: %s", 'Yes' if result['has_preamble'] else 'No')
+    if result['metadata']:
+        logger.info("Official Number: %s", result['metadata'].get('official_number', 'N/A'))
+        logger.info("Title: %s", result['metadata'].get('official_title', 'N/A'))
+        logger.info("Type: %s", result['metadata'].get('law_type_id', 'N/A'))
+        logger.info("Date: %s", result['metadata'].get('enactment_date', 'N/A'))
+    logger.info("📋 Next step: python main.py v40-analyze --source-id %s", args.source_id)
+
+def _handle_v40_analyze(args):
+    """Kritis V4.0 Stage 2: PROD10 Definitive Analyst with V4.2 prompts"""
+    kritis_v40 = _v40()
+    result = kritis_v40.run_definitive_analyst_phase(args.source_id)
+    logger.info("🎯 Kritis V4.0 Stage 2 completed successfully")
+    logger.info("📊 PROD10 Analysis Results (V4.2 prompts):")
+    logger.info("Items Analyzed: %s", result['total_items_analyzed'])
+    logger.info("Successful Analyses: %s", result['successful_analyses'])
+    logger.info("Completion Rate: %.1f%%", result['completion_rate'])
+    
+    if result['successful_analyses'] < result['total_items_analyzed']:
+        failed = result['total_items_analyzed'] - result['successful_analyses']
+        logger.warning("⚠️ %s items had analysis errors and will use fallback data", failed)
+    
+    logger.info("📋 Next step: python main.py v40-synthesize --source-id %s", args.source_id)
+
+def _handle_v40_synthesize(args):
+    """Kritis V4.0 Stage 3: PROD10 Final Summary Synthesis"""
+    kritis_v40 = _v40()
+    result = kritis_v40.run_final_synthesis_phase(args.source_id)
+    logger.info("🎯 Kritis V4.0 Stage 3 completed successfully")
+    logger.info("📝 PROD10 Synthesis Results:")
+    logger.info("Synthesis Completed: %s", 'Yes' if result['synthesis_completed'] else 'No')
+    logger.info("Suggested Category: %s", result.get('suggested_category', 'Unknown'))
+    logger.info("Summaries Processed: %s", result.get('summaries_processed', 0))
+    
+    logger.info("📋 Next step: python main.py v40-ingest --source-id %s", args.source_id)
+
+def _handle_v40_ingest(args):
+    """Kritis V4.0 Stage 4: PROD10 Definitive Law Ingestion"""
+    kritis_v40 = _v40()
+    law_id = kritis_v40.run_definitive_law_ingestion(args.source_id)
+    logger.info("🎯 Kritis V4.0 Stage 4 completed successfully")
+    logger.info("📚 Law created with PROD10 definitive specifications: %s", law_id)
+    logger.info("✅ Full Kritis V4.0 PROD10 Pipeline completed!")
+
+def _handle_v40_complete(args):
+    """Kritis V4.0 Complete Pipeline: All stages in sequence"""
+    logger.info("🚀 Starting Kritis V4.0 Complete PROD10 Pipeline")
+    kritis_v40 = _v40()
+    
+    law_id = kritis_v40.run_complete_v40_pipeline(args.source_id)
+    
+    logger.info("🎉 Complete Kritis V4.0 PROD10 Pipeline finished successfully!")
+    logger.info("📚 Final Law ID: %s", law_id)
+    logger.info("🔗 The law follows the PROD10 definitive specifications:")
+    logger.info("   - Perfected AI persona with specific style guide")
+    logger.info("   - Enhanced tag structure with organized categories")
+    logger.info("   - Cross-reference processing with relationship types")
+    logger.info("   - Final summary synthesis with category suggestions")
+
+# ========================================
+# KRITIS V5.0 COMMANDS (ENHANCED RELATIONSHIPS) - RECOMMENDED
+# ========================================
+
+def _handle_v50_extract(args):
+    """Kritis V5.0 Stage 1: Enhanced Extractor"""
+    logger.info("🚀 Using Kritis V5.0 Enhanced Relationship Pipeline (RECOMMENDED)")
+    kritis_v50 = _v50()
+    result = kritis_v50.run_enhanced_extractor_phase(args.source_id)
+    logger.info("🎯 Kritis V5.0 Stage 1 completed successfully")
+    logger.info("📄 Extraction Results:")
+    logger.info("Total Articles: %s", result['total_articles'])
+    logger.info("Has Preamble: %s", 'Yes' if result['has_preamble'] else 'No')
+    if result['metadata']:
+        logger.info("Official Number: %s", result['metadata'].get('official_number', 'N/A'))
+        logger.info("Title: %s", result['metadata'].get('official_title', 'N/A'))
+        logger.info("Date: %s", result['metadata'].get('enactment_date', 'N/A'))
+    logger.info("📋 Next step: python main.py v50-analyze --source-id %s", args.source_id)
+
+def _handle_v50_analyze(args):
+    """Kritis V5.0 Stage 2: Enhanced Analyst with Cross-References"""
+    kritis_v50 = _v50()
+    result = kritis_v50.run_kritis_v50_analyst_phase(args.source_id)
+    logger.info("🎯 Kritis V5.0 Stage 2 completed successfully")
+    logger.info("📊 Enhanced Analysis with Cross-References:")
+    logger.info("Items Analyzed: %s", result['total_items_analyzed'])
+    logger.info("Successful: %s", result['successful_analyses'])
+    logger.info("Completion Rate: %.1f%%", result['completion_rate'])
+    logger.info("📋 Next step: python main.py v50-build-graph --source-id %s", args.source_id)
+
+def _handle_v50_build_graph(args):
+    """Kritis V5.0 Stage 3: Knowledge Graph Builder"""
+    kritis_v50 = _v50()
+    result = kritis_v50.run_knowledge_graph_builder_phase(args.source_id)
+    logger.info("🎯 Kritis V5.0 Stage 3 completed successfully")
+    logger.info("📚 Law created with enhanced relationship graph: %s", result['law_id'])
+    logger.info("🔗 Relationships Created:")
+    logger.info("   - Law-to-Law: %s", result['relationships_created']['law_relationships'])
+    logger.info("   - Article-to-Article: %s", result['relationships_created']['article_references'])
+    logger.info("✅ Full Kritis V5.0 Pipeline completed!")
+
+def _handle_v50_complete(args):
+    """Kritis V5.0 Complete Pipeline: All stages in sequence"""
+    logger.info("🚀 Starting Kritis V5.0 Complete Enhanced Relationship Pipeline (RECOMMENDED)")
+    kritis_v50 = _v50()
+    
+    # Stage 1: Extract
+    logger.info("📋 Stage 1/3: Enhanced Extraction...")
+    extract_result = kritis_v50.run_enhanced_extractor_phase(args.source_id)
+    logger.info("✅ Stage 1 complete: %s articles", extract_result['total_articles'])
+    
+    # Stage 2: Analyze with Enhanced Cross-References
+    logger.info("📋 Stage 2/3: Enhanced Analysis with Cross-References...")
+    analyze_result = kritis_v50.run_kritis_v50_analyst_phase(args.source_id)
+    logger.info("✅ Stage 2 complete: %s/%s items (%.1f%%)", analyze_result['successful_analyses'], analyze_result['total_items_analyzed'], analyze_result['completion_rate'])
+    
+    # Stage 3: Build Knowledge Graph
+    logger.info("📋 Stage 3/3: Knowledge Graph Building...")
+    graph_result = kritis_v50.run_knowledge_graph_builder_phase(args.source_id)
+    logger.info("✅ Stage 3 complete: Law %s", graph_result['law_id'])
+    
+    logger.info("🎉 Complete Kritis V5.0 Pipeline finished successfully!")
+    logger.info("📚 Final Law ID: %s", graph_result['law_id'])
+    logger.info("🔗 Enhanced Relationship Features:")
+    logger.info("   - URL-based reference matching (reliable)")
+    logger.info("   - Article-to-article relationships: %s", graph_result['relationships_created']['article_references'])
+    logger.info("   - Law-to-law relationships: %s", graph_result['relationships_created']['law_relationships'])
+    logger.info("   - Temporal consistency validation")
+    logger.info("   - Automatic status updates (superseded/revoked)")
+
+# ========================================
+# KRITIS V6.0 COMMANDS (PRODUCTION ANALYST) - RECOMMENDED
+# ========================================
+
+def _handle_v6_extract(args):
+    """Kritis V6.0 Stage 1: Enhanced Extractor"""
+    logger.info("🚀 Using Kritis V6.0 Production Analyst Pipeline (RECOMMENDED)")
+    kritis_v6 = _v6()
+    result = kritis_v6.run_enhanced_extractor_phase(args.source_id)
+    logger.info("🎯 Kritis V6.0 Stage 1 completed successfully")
+    logger.info("📄 Extraction Results:")
+    logger.info("Total Articles: %s", result['total_articles'])
+    logger.info("Has Preamble: %s", 'Yes' if result['has_preamble'] else 'No')
+    if result['metadata']:
+        logger.info("Official Number: %s", result['metadata'].get('official_number', 'N/A'))
+        logger.info("Title: %s", result['metadata'].get('official_title', 'N/A'))
+        logger.info("Date: %s", result['metadata'].get('enactment_date', 'N/A'))
+    logger.info("📋 Next step: python main.py v6-map --source-id %s", args.source_id)
+
+def _handle_v6_map(args):
+    """Kritis V6.0 Stage 2: Map Phase (PT-only analysis)"""
+    kritis_v6 = _v6()
+    result = kritis_v6.run_kritis_v6_map_phase(args.source_id)
+    logger.info("🎯 Kritis V6.0 Stage 2 (Map Phase) completed successfully")
+    logger.info("📊 Portuguese-only Analysis:")
+    logger.info("Items Analyzed: %s", result['total_items_analyzed'])
+    logger.info("Successful: %s", result['successful_analyses'])
+    logger.info("Completion Rate: %.1f%%", result['completion_rate'])
+    logger.info("💡 Translation will happen locally in next stage")
+    logger.info("📋 Next step: python main.py v6-build-graph --source-id %s", args.source_id)
+
+def _handle_v6_build_graph(args):
+    """Kritis V6.0 Stage 3: Knowledge Graph Builder with Local Translation"""
+    kritis_v6 = _v6()
+    result = kritis_v6.run_knowledge_graph_builder_phase(args.source_id)
+    logger.info("🎯 Kritis V6.0 Stage 3 completed successfully")
+    logger.info("📚 Law created with cost-optimized workflow: %s", result['law_id'])
+    logger.info("🔗 Relationships Created:")
+    logger.info("   - Law-to-Law: %s", result['relationships_created']['law_relationships'])
+    logger.info("   - Article-to-Article: %s", result['relationships_created']['article_references'])
+    logger.info("🌍 Local translation applied to all content")
+    logger.info("✅ Full Kritis V6.0 Pipeline completed!")
+
+def _handle_v6_complete(args):
+    """Kritis V6.0 Complete Pipeline: All stages in sequence"""
+    logger.info("🚀 Starting Kritis V6.0 Complete Production Analyst Pipeline (RECOMMENDED)")
+    kritis_v6 = _v6()
+    
+    # Stage 1: Extract
+    logger.info("📋 Stage 1/3: Extraction...")
+    extract_result = kritis_v6.run_enhanced_extractor_phase(args.source_id)
+    logger.info("✅ Stage 1 complete: %s articles", extract_result['total_articles'])
+    
+    # Stage 2: Map Phase (PT-only analysis)
+    logger.info("📋 Stage 2/3: Map Phase (PT-only analysis)...")
+    map_result = kritis_v6.run_kritis_v6_map_phase(args.source_id)
+    logger.info("✅ Stage 2 complete: %s/%s items (%.1f%%)", map_result['successful_analyses'], map_result['total_items_analyzed'], map_result['completion_rate'])
+    
+    # Stage 3: Build Knowledge Graph with Local Translation
+    logger.info("📋 Stage 3/3: Knowledge Graph Building (with local translation)...")
+    graph_result = kritis_v6.run_knowledge_graph_builder_phase(args.source_id)
+    logger.info("✅ Stage 3 complete: Law %s", graph_result['law_id'])
+    
+    logger.info("🎉 Complete Kritis V6.0 Pipeline finished successfully!")
+    logger.info("📚 Final Law ID: %s", graph_result['law_id'])
+    logger.info("💰 Cost Optimization Features:")
+    logger.info("   - AI only analyzes in Portuguese (source language)")
+    logger.info("   - Local translation (argos-translate + googletrans fallback)")
+    logger.info("   - Token-aware Reduce phase for large laws")
+    logger.info("   - Multilingual tag aggregation")
+    logger.info("🔗 Enhanced Relationship Features:")
+    logger.info("   - Article-to-article relationships: %s", graph_result['relationships_created']['article_references'])
+    logger.info("   - Law-to-law relationships: %s", graph_result['relationships_created']['law_relationships'])
+    logger.info("   - Temporal consistency validation")
+    logger.info("   - Automatic status updates")
+
+# Command name -> stage handler (describe-workflows is handled before validation)
+COMMAND_HANDLERS = {
+    'v40-extract': _handle_v40_extract,
+    'v40-analyze': _handle_v40_analyze,
+    'v40-synthesize': _handle_v40_synthesize,
+    'v40-ingest': _handle_v40_ingest,
+    'v40-complete': _handle_v40_complete,
+    'v50-extract': _handle_v50_extract,
+    'v50-analyze': _handle_v50_analyze,
+    'v50-build-graph': _handle_v50_build_graph,
+    'v50-complete': _handle_v50_complete,
+    'v6-extract': _handle_v6_extract,
+    'v6-map': _handle_v6_map,
+    'v6-build-graph': _handle_v6_build_graph,
+    'v6-complete': _handle_v6_complete,
+}
+
+# Static workflow manifest for describe-workflows, serialized once at import
+_WORKFLOWS_MANIFEST = [
+    {
+        "id": "v40-complete",
+        "name": "Kritis V4.0 - Complete Pipeline (PROD10)",
+        "description": "Runs the complete V4.0 pipeline with all 4 stages: extraction, analysis, synthesis, and law ingestion. This is the production-ready PROD10 version.",
+        "stages": ["extract", "analyze", "synthesize", "ingest"],
+        "version": "4.0",
+        "status": "stable",
+        "recommended": False
+    },
+    {
+        "id": "v40-extract",
+        "name": "Kritis V4.0 - Extraction Only",
+        "description": "Runs only the PROD10 enhanced extraction stage. Extracts preamble and articles from legal documents.",
+        "stages": ["extract"],
+        "version": "4.0",
+        "status": "stable",
+        "recommended": False
+    },
+    {
+        "id": "v40-analyze",
+        "name": "Kritis V4.0 - Analysis Only",
+        "description": "Runs only the PROD10 analysis stage with V4.2 prompts. Analyzes extracted content.",
+        "stages": ["analyze"],
+        "version": "4.0",
+        "status": "stable",
+        "recommended": False
+    },
+    {
+        "id": "v40-synthesize",
+        "name": "Kritis V4.0 - Synthesis Only",
+        "description": "Runs only the PROD10 synthesis stage. Creates final summary and category suggestions.",
+        "stages": ["synthesize"],
+        "version": "4.0",
+        "status": "stable",
+        "recommended": False
+    },
+    {
+        "id": "v40-ingest",
+        "name": "Kritis V4.0 - Ingestion Only",
+        "description": "Runs only the PROD10 law ingestion stage. Creates law records with cross-references.",
+        "stages": ["ingest"],
+        "version": "4.0",
+        "status": "stable",
+        "recommended": False
+    },
+    {
+        "id": "v50-complete",
+        "name": "Kritis V5.0 - Complete Pipeline (Enhanced Relationships)",
+        "description": "Runs the complete V5.0 pipeline with enhanced relationship processing. Features URL-based reference matching, law-to-law and article-to-article relationships, temporal validation, and automatic status updates. RECOMMENDED for new documents.",
+        "stages": ["extract", "analyze", "build-graph"],
+        "version": "5.0",
+        "status": "stable",
+        "recommended": True,
+        "features": [
+            "URL-based reference matching",
+            "Law-to-law relationships",
+            "Article-to-article relationships",
+            "Preamble cross-reference processing",
+            "Temporal consistency validation",
+            "Automatic status updates (superseded/revoked)",
+            "Conflict resolution with delete_law_and_children()"
+        ]
+    },
+    {
+        "id": "v50-extract",
+        "name": "Kritis V5.0 - Extraction Only",
+        "description": "Runs only the enhanced extraction stage with HTML preservation.",
+        "stages": ["extract"],
+        "version": "5.0",
+        "status": "stable",
+        "recommended": False
+    },
+    {
+        "id": "v50-analyze",
+        "name": "Kritis V5.0 - Analysis Only",
+        "description": "Runs only the enhanced analysis stage with cross-reference extraction (URLs + article numbers).",
+        "stages": ["analyze"],
+        "version": "5.0",
+        "status": "stable",
+        "recommended": False
+    },
+    {
+        "id": "v50-build-graph",
+        "name": "Kritis V5.0 - Knowledge Graph Builder Only",
+        "description": "Runs only the knowledge graph building stage with consistent relationship processing.",
+        "stages": ["build-graph"],
+        "version": "5.0",
+        "status": "stable",
+        "recommended": False
+    },
+    {
+        "id": "v6-complete",
+        "name": "Kritis V6.0 - Complete Pipeline (Production Analyst)",
+        "description": "Runs the complete V6.0 pipeline with cost optimization: Portuguese-only AI analysis, local translation (argos-translate + googletrans), token-aware Reduce phase. RECOMMENDED for production use.",
+        "stages": ["extract", "map", "build-graph"],
+        "version": "6.0",
+        "status": "stable",
+        "recommended": True,
+        "features": [
+            "Portuguese-only AI analysis (source language)",
+            "Local translation (argos-translate with googletrans fallback)",
+            "Token-aware Reduce phase for large laws",
+            "Enhanced AI persona with style guide",
+            "Multilingual tag aggregation",
+            "Cost-optimized workflow",
+            "All V5.0 relationship features"
+        ]
+    },
+    {
+        "id": "v6-extract",
+        "name": "Kritis V6.0 - Extraction Only",
+        "description": "Runs only the extraction stage.",
+        "stages": ["extract"],
+        "version": "6.0",
+        "status": "stable",
+        "recommended": False
+    },
+    {
+        "id": "v6-map",
+        "name": "Kritis V6.0 - Map Phase Only",
+        "description": "Runs only the Map phase with Portuguese-only analysis.",
+        "stages": ["map"],
+        "version": "6.0",
+        "status": "stable",
+        "recommended": False
+    },
+    {
+        "id": "v6-build-graph",
+        "name": "Kritis V6.0 - Knowledge Graph Builder Only",
+        "description": "Runs only the knowledge graph building with local translation and token-aware Reduce.",
+        "stages": ["build-graph"],
+        "version": "6.0",
+        "status": "stable",
+        "recommended": False
+    }
+]
+_WORKFLOWS_JSON = json_utils.dumps(_WORKFLOWS_MANIFEST, indent=True)
+
 def main():
     parser = argparse.ArgumentParser(
         description='Agora Analyst - AI Analysis Service for Legal Documents',
@@ -221,145 +604,7 @@ Examples:
     
     # Handle describe-workflows command (doesn't require validation or source_id)
     if args.command == 'describe-workflows':
-        import json
-        workflows = [
-            {
-                "id": "v40-complete",
-                "name": "Kritis V4.0 - Complete Pipeline (PROD10)",
-                "description": "Runs the complete V4.0 pipeline with all 4 stages: extraction, analysis, synthesis, and law ingestion. This is the production-ready PROD10 version.",
-                "stages": ["extract", "analyze", "synthesize", "ingest"],
-                "version": "4.0",
-                "status": "stable",
-                "recommended": False
-            },
-            {
-                "id": "v40-extract",
-                "name": "Kritis V4.0 - Extraction Only",
-                "description": "Runs only the PROD10 enhanced extraction stage. Extracts preamble and articles from legal documents.",
-                "stages": ["extract"],
-                "version": "4.0",
-                "status": "stable",
-                "recommended": False
-            },
-            {
-                "id": "v40-analyze",
-                "name": "Kritis V4.0 - Analysis Only",
-                "description": "Runs only the PROD10 analysis stage with V4.2 prompts. Analyzes extracted content.",
-                "stages": ["analyze"],
-                "version": "4.0",
-                "status": "stable",
-                "recommended": False
-            },
-            {
-                "id": "v40-synthesize",
-                "name": "Kritis V4.0 - Synthesis Only",
-                "description": "Runs only the PROD10 synthesis stage. Creates final summary and category suggestions.",
-                "stages": ["synthesize"],
-                "version": "4.0",
-                "status": "stable",
-                "recommended": False
-            },
-            {
-                "id": "v40-ingest",
-                "name": "Kritis V4.0 - Ingestion Only",
-                "description": "Runs only the PROD10 law ingestion stage. Creates law records with cross-references.",
-                "stages": ["ingest"],
-                "version": "4.0",
-                "status": "stable",
-                "recommended": False
-            },
-            {
-                "id": "v50-complete",
-                "name": "Kritis V5.0 - Complete Pipeline (Enhanced Relationships)",
-                "description": "Runs the complete V5.0 pipeline with enhanced relationship processing. Features URL-based reference matching, law-to-law and article-to-article relationships, temporal validation, and automatic status updates. RECOMMENDED for new documents.",
-                "stages": ["extract", "analyze", "build-graph"],
-                "version": "5.0",
-                "status": "stable",
-                "recommended": True,
-                "features": [
-                    "URL-based reference matching",
-                    "Law-to-law relationships",
-                    "Article-to-article relationships",
-                    "Preamble cross-reference processing",
-                    "Temporal consistency validation",
-                    "Automatic status updates (superseded/revoked)",
-                    "Conflict resolution with delete_law_and_children()"
-                ]
-            },
-            {
-                "id": "v50-extract",
-                "name": "Kritis V5.0 - Extraction Only",
-                "description": "Runs only the enhanced extraction stage with HTML preservation.",
-                "stages": ["extract"],
-                "version": "5.0",
-                "status": "stable",
-                "recommended": False
-            },
-            {
-                "id": "v50-analyze",
-                "name": "Kritis V5.0 - Analysis Only",
-                "description": "Runs only the enhanced analysis stage with cross-reference extraction (URLs + article numbers).",
-                "stages": ["analyze"],
-                "version": "5.0",
-                "status": "stable",
-                "recommended": False
-            },
-            {
-                "id": "v50-build-graph",
-                "name": "Kritis V5.0 - Knowledge Graph Builder Only",
-                "description": "Runs only the knowledge graph building stage with consistent relationship processing.",
-                "stages": ["build-graph"],
-                "version": "5.0",
-                "status": "stable",
-                "recommended": False
-            },
-            {
-                "id": "v6-complete",
-                "name": "Kritis V6.0 - Complete Pipeline (Production Analyst)",
-                "description": "Runs the complete V6.0 pipeline with cost optimization: Portuguese-only AI analysis, local translation (argos-translate + googletrans), token-aware Reduce phase. RECOMMENDED for production use.",
-                "stages": ["extract", "map", "build-graph"],
-                "version": "6.0",
-                "status": "stable",
-                "recommended": True,
-                "features": [
-                    "Portuguese-only AI analysis (source language)",
-                    "Local translation (argos-translate with googletrans fallback)",
-                    "Token-aware Reduce phase for large laws",
-                    "Enhanced AI persona with style guide",
-                    "Multilingual tag aggregation",
-                    "Cost-optimized workflow",
-                    "All V5.0 relationship features"
-                ]
-            },
-            {
-                "id": "v6-extract",
-                "name": "Kritis V6.0 - Extraction Only",
-                "description": "Runs only the extraction stage.",
-                "stages": ["extract"],
-                "version": "6.0",
-                "status": "stable",
-                "recommended": False
-            },
-            {
-                "id": "v6-map",
-                "name": "Kritis V6.0 - Map Phase Only",
-                "description": "Runs only the Map phase with Portuguese-only analysis.",
-                "stages": ["map"],
-                "version": "6.0",
-                "status": "stable",
-                "recommended": False
-            },
-            {
-                "id": "v6-build-graph",
-                "name": "Kritis V6.0 - Knowledge Graph Builder Only",
-                "description": "Runs only the knowledge graph building with local translation and token-aware Reduce.",
-                "stages": ["build-graph"],
-                "version": "6.0",
-                "status": "stable",
-                "recommended": False
-            }
-        ]
-        print(json.dumps(workflows, indent=2))
+        sys.stdout.write(_WORKFLOWS_JSON + '\n')
         return
     
     # Production validation (required for all other commands)
@@ -368,236 +613,19 @@ Examples:
         sys.exit(1)
     
     if not hasattr(args, 'source_id') or not args.source_id or not validate_uuid(args.source_id):
-        logger.error(f"❌ Invalid source ID format. Expected UUID, got: {getattr(args, 'source_id', 'None')}")
+        logger.error("❌ Invalid source ID format. Expected UUID, got: %s", getattr(args, 'source_id', 'None'))
         sys.exit(1)
     
     # Get job_id if provided for background job tracking
     job_id = getattr(args, 'job_id', None)
     if job_id:
-        logger.info(f"📌 Background job ID: {job_id}")
+        logger.info("📌 Background job ID: %s", job_id)
     
-    logger.info(f"🚀 Starting Kritis Analysis for Source ID: {args.source_id}")
-    logger.info(f"📋 Command: {args.command}")
+    logger.info("🚀 Starting Kritis Analysis for Source ID: %s", args.source_id)
+    logger.info("📋 Command: %s", args.command)
 
     try:
-        # ========================================
-        # KRITIS V4.0 COMMANDS (PROD10)
-        # ========================================
-        
-        if args.command == 'v40-extract':
-
-            # Kritis V4.0 Stage 1: PROD10 Enhanced Extractor
-            logger.info("🚀 Using Kritis V4.0 PROD10 Pipeline")
-            kritis_v40 = KritisAnalyzerV40()
-            result = kritis_v40.run_enhanced_extractor_phase(args.source_id)
-            logger.info("🎯 Kritis V4.0 Stage 1 completed successfully")
-            logger.info(f"📄 PROD10 Extraction Results:")
-            logger.info(f"Total Articles Found: {result['total_articles']}")
-            logger.info(f"Has Preamble: {'Yes' if result['has_preamble'] else 'No'}")
-            if result['metadata']:
-                logger.info(f"Official Number: {result['metadata'].get('official_number', 'N/A')}")
-                logger.info(f"Title: {result['metadata'].get('official_title', 'N/A')}")
-                logger.info(f"Type: {result['metadata'].get('law_type_id', 'N/A')}")
-                logger.info(f"Date: {result['metadata'].get('enactment_date', 'N/A')}")
-            logger.info("📋 Next step: python main.py v40-analyze --source-id " + args.source_id)
-            
-        elif args.command == 'v40-analyze':
-            # Kritis V4.0 Stage 2: PROD10 Definitive Analyst with V4.2 prompts
-            kritis_v40 = KritisAnalyzerV40()
-            result = kritis_v40.run_definitive_analyst_phase(args.source_id)
-            logger.info("🎯 Kritis V4.0 Stage 2 completed successfully")
-            logger.info(f"📊 PROD10 Analysis Results (V4.2 prompts):")
-            logger.info(f"Items Analyzed: {result['total_items_analyzed']}")
-            logger.info(f"Successful Analyses: {result['successful_analyses']}")
-            logger.info(f"Completion Rate: {result['completion_rate']:.1f}%")
-            
-            if result['successful_analyses'] < result['total_items_analyzed']:
-                failed = result['total_items_analyzed'] - result['successful_analyses']
-                logger.warning(f"⚠️ {failed} items had analysis errors and will use fallback data")
-            
-            logger.info("📋 Next step: python main.py v40-synthesize --source-id " + args.source_id)
-            
-        elif args.command == 'v40-synthesize':
-            # Kritis V4.0 Stage 3: PROD10 Final Summary Synthesis
-            kritis_v40 = KritisAnalyzerV40()
-            result = kritis_v40.run_final_synthesis_phase(args.source_id)
-            logger.info("🎯 Kritis V4.0 Stage 3 completed successfully")
-            logger.info(f"📝 PROD10 Synthesis Results:")
-            logger.info(f"Synthesis Completed: {'Yes' if result['synthesis_completed'] else 'No'}")
-            logger.info(f"Suggested Category: {result.get('suggested_category', 'Unknown')}")
-            logger.info(f"Summaries Processed: {result.get('summaries_processed', 0)}")
-            
-            logger.info("📋 Next step: python main.py v40-ingest --source-id " + args.source_id)
-            
-        elif args.command == 'v40-ingest':
-            # Kritis V4.0 Stage 4: PROD10 Definitive Law Ingestion
-            kritis_v40 = KritisAnalyzerV40()
-            law_id = kritis_v40.run_definitive_law_ingestion(args.source_id)
-            logger.info(f"🎯 Kritis V4.0 Stage 4 completed successfully")
-            logger.info(f"📚 Law created with PROD10 definitive specifications: {law_id}")
-            logger.info("✅ Full Kritis V4.0 PROD10 Pipeline completed!")
-            
-        elif args.command == 'v40-complete':
-            # Kritis V4.0 Complete Pipeline: All stages in sequence
-            logger.info("🚀 Starting Kritis V4.0 Complete PROD10 Pipeline")
-            kritis_v40 = KritisAnalyzerV40()
-            
-            law_id = kritis_v40.run_complete_v40_pipeline(args.source_id)
-            
-            logger.info("🎉 Complete Kritis V4.0 PROD10 Pipeline finished successfully!")
-            logger.info(f"📚 Final Law ID: {law_id}")
-            logger.info("🔗 The law follows the PROD10 definitive specifications:")
-            logger.info("   - Perfected AI persona with specific style guide")
-            logger.info("   - Enhanced tag structure with organized categories")
-            logger.info("   - Cross-reference processing with relationship types")
-            logger.info("   - Final summary synthesis with category suggestions")
-        
-        # ========================================
-        # KRITIS V5.0 COMMANDS (ENHANCED RELATIONSHIPS) - RECOMMENDED
-        # ========================================
-        
-        elif args.command == 'v50-extract':
-            # Kritis V5.0 Stage 1: Enhanced Extractor
-            logger.info("🚀 Using Kritis V5.0 Enhanced Relationship Pipeline (RECOMMENDED)")
-            kritis_v50 = KritisAnalyzerV50()
-            result = kritis_v50.run_enhanced_extractor_phase(args.source_id)
-            logger.info("🎯 Kritis V5.0 Stage 1 completed successfully")
-            logger.info(f"📄 Extraction Results:")
-            logger.info(f"Total Articles: {result['total_articles']}")
-            logger.info(f"Has Preamble: {'Yes' if result['has_preamble'] else 'No'}")
-            if result['metadata']:
-                logger.info(f"Official Number: {result['metadata'].get('official_number', 'N/A')}")
-                logger.info(f"Title: {result['metadata'].get('official_title', 'N/A')}")
-                logger.info(f"Date: {result['metadata'].get('enactment_date', 'N/A')}")
-            logger.info("📋 Next step: python main.py v50-analyze --source-id " + args.source_id)
-        
-        elif args.command == 'v50-analyze':
-            # Kritis V5.0 Stage 2: Enhanced Analyst with Cross-References
-            kritis_v50 = KritisAnalyzerV50()
-            result = kritis_v50.run_kritis_v50_analyst_phase(args.source_id)
-            logger.info("🎯 Kritis V5.0 Stage 2 completed successfully")
-            logger.info(f"📊 Enhanced Analysis with Cross-References:")
-            logger.info(f"Items Analyzed: {result['total_items_analyzed']}")
-            logger.info(f"Successful: {result['successful_analyses']}")
-            logger.info(f"Completion Rate: {result['completion_rate']:.1f}%")
-            logger.info("📋 Next step: python main.py v50-build-graph --source-id " + args.source_id)
-        
-        elif args.command == 'v50-build-graph':
-            # Kritis V5.0 Stage 3: Knowledge Graph Builder
-            kritis_v50 = KritisAnalyzerV50()
-            result = kritis_v50.run_knowledge_graph_builder_phase(args.source_id)
-            logger.info("🎯 Kritis V5.0 Stage 3 completed successfully")
-            logger.info(f"📚 Law created with enhanced relationship graph: {result['law_id']}")
-            logger.info(f"🔗 Relationships Created:")
-            logger.info(f"   - Law-to-Law: {result['relationships_created']['law_relationships']}")
-            logger.info(f"   - Article-to-Article: {result['relationships_created']['article_references']}")
-            logger.info("✅ Full Kritis V5.0 Pipeline completed!")
-        
-        elif args.command == 'v50-complete':
-            # Kritis V5.0 Complete Pipeline: All stages in sequence
-            logger.info("🚀 Starting Kritis V5.0 Complete Enhanced Relationship Pipeline (RECOMMENDED)")
-            kritis_v50 = KritisAnalyzerV50()
-            
-            # Stage 1: Extract
-            logger.info("📋 Stage 1/3: Enhanced Extraction...")
-            extract_result = kritis_v50.run_enhanced_extractor_phase(args.source_id)
-            logger.info(f"✅ Stage 1 complete: {extract_result['total_articles']} articles")
-            
-            # Stage 2: Analyze with Enhanced Cross-References
-            logger.info("📋 Stage 2/3: Enhanced Analysis with Cross-References...")
-            analyze_result = kritis_v50.run_kritis_v50_analyst_phase(args.source_id)
-            logger.info(f"✅ Stage 2 complete: {analyze_result['successful_analyses']}/{analyze_result['total_items_analyzed']} items ({analyze_result['completion_rate']:.1f}%)")
-            
-            # Stage 3: Build Knowledge Graph
-            logger.info("📋 Stage 3/3: Knowledge Graph Building...")
-            graph_result = kritis_v50.run_knowledge_graph_builder_phase(args.source_id)
-            logger.info(f"✅ Stage 3 complete: Law {graph_result['law_id']}")
-            
-            logger.info("🎉 Complete Kritis V5.0 Pipeline finished successfully!")
-            logger.info(f"📚 Final Law ID: {graph_result['law_id']}")
-            logger.info("🔗 Enhanced Relationship Features:")
-            logger.info(f"   - URL-based reference matching (reliable)")
-            logger.info(f"   - Article-to-article relationships: {graph_result['relationships_created']['article_references']}")
-            logger.info(f"   - Law-to-law relationships: {graph_result['relationships_created']['law_relationships']}")
-            logger.info("   - Temporal consistency validation")
-            logger.info("   - Automatic status updates (superseded/revoked)")
-        
-        # ========================================
-        # KRITIS V6.0 COMMANDS (PRODUCTION ANALYST) - RECOMMENDED
-        # ========================================
-        
-        elif args.command == 'v6-extract':
-            # Kritis V6.0 Stage 1: Enhanced Extractor
-            logger.info("🚀 Using Kritis V6.0 Production Analyst Pipeline (RECOMMENDED)")
-            kritis_v6 = KritisAnalyzerV6()
-            result = kritis_v6.run_enhanced_extractor_phase(args.source_id)
-            logger.info("🎯 Kritis V6.0 Stage 1 completed successfully")
-            logger.info(f"📄 Extraction Results:")
-            logger.info(f"Total Articles: {result['total_articles']}")
-            logger.info(f"Has Preamble: {'Yes' if result['has_preamble'] else 'No'}")
-            if result['metadata']:
-                logger.info(f"Official Number: {result['metadata'].get('official_number', 'N/A')}")
-                logger.info(f"Title: {result['metadata'].get('official_title', 'N/A')}")
-                logger.info(f"Date: {result['metadata'].get('enactment_date', 'N/A')}")
-            logger.info("📋 Next step: python main.py v6-map --source-id " + args.source_id)
-        
-        elif args.command == 'v6-map':
-            # Kritis V6.0 Stage 2: Map Phase (PT-only analysis)
-            kritis_v6 = KritisAnalyzerV6()
-            result = kritis_v6.run_kritis_v6_map_phase(args.source_id)
-            logger.info("🎯 Kritis V6.0 Stage 2 (Map Phase) completed successfully")
-            logger.info(f"📊 Portuguese-only Analysis:")
-            logger.info(f"Items Analyzed: {result['total_items_analyzed']}")
-            logger.info(f"Successful: {result['successful_analyses']}")
-            logger.info(f"Completion Rate: {result['completion_rate']:.1f}%")
-            logger.info("💡 Translation will happen locally in next stage")
-            logger.info("📋 Next step: python main.py v6-build-graph --source-id " + args.source_id)
-        
-        elif args.command == 'v6-build-graph':
-            # Kritis V6.0 Stage 3: Knowledge Graph Builder with Local Translation
-            kritis_v6 = KritisAnalyzerV6()
-            result = kritis_v6.run_knowledge_graph_builder_phase(args.source_id)
-            logger.info("🎯 Kritis V6.0 Stage 3 completed successfully")
-            logger.info(f"📚 Law created with cost-optimized workflow: {result['law_id']}")
-            logger.info(f"🔗 Relationships Created:")
-            logger.info(f"   - Law-to-Law: {result['relationships_created']['law_relationships']}")
-            logger.info(f"   - Article-to-Article: {result['relationships_created']['article_references']}")
-            logger.info(f"🌍 Local translation applied to all content")
-            logger.info("✅ Full Kritis V6.0 Pipeline completed!")
-        
-        elif args.command == 'v6-complete':
-            # Kritis V6.0 Complete Pipeline: All stages in sequence
-            logger.info("🚀 Starting Kritis V6.0 Complete Production Analyst Pipeline (RECOMMENDED)")
-            kritis_v6 = KritisAnalyzerV6()
-            
-            # Stage 1: Extract
-            logger.info("📋 Stage 1/3: Extraction...")
-            extract_result = kritis_v6.run_enhanced_extractor_phase(args.source_id)
-            logger.info(f"✅ Stage 1 complete: {extract_result['total_articles']} articles")
-            
-            # Stage 2: Map Phase (PT-only analysis)
-            logger.info("📋 Stage 2/3: Map Phase (PT-only analysis)...")
-            map_result = kritis_v6.run_kritis_v6_map_phase(args.source_id)
-            logger.info(f"✅ Stage 2 complete: {map_result['successful_analyses']}/{map_result['total_items_analyzed']} items ({map_result['completion_rate']:.1f}%)")
-            
-            # Stage 3: Build Knowledge Graph with Local Translation
-            logger.info("📋 Stage 3/3: Knowledge Graph Building (with local translation)...")
-            graph_result = kritis_v6.run_knowledge_graph_builder_phase(args.source_id)
-            logger.info(f"✅ Stage 3 complete: Law {graph_result['law_id']}")
-            
-            logger.info("🎉 Complete Kritis V6.0 Pipeline finished successfully!")
-            logger.info(f"📚 Final Law ID: {graph_result['law_id']}")
-            logger.info("💰 Cost Optimization Features:")
-            logger.info("   - AI only analyzes in Portuguese (source language)")
-            logger.info("   - Local translation (argos-translate + googletrans fallback)")
-            logger.info("   - Token-aware Reduce phase for large laws")
-            logger.info("   - Multilingual tag aggregation")
-            logger.info("🔗 Enhanced Relationship Features:")
-            logger.info(f"   - Article-to-article relationships: {graph_result['relationships_created']['article_references']}")
-            logger.info(f"   - Law-to-law relationships: {graph_result['relationships_created']['law_relationships']}")
-            logger.info("   - Temporal consistency validation")
-            logger.info("   - Automatic status updates")
-            
+        COMMAND_HANDLERS[args.command](args)
     except KeyboardInterrupt:
         logger.warning("⚠️ Analysis interrupted by user")
         update_job_status(
@@ -607,14 +635,14 @@ Examples:
         )
         sys.exit(130)
     except Exception as e:
-        logger.error(f"❌ Command failed: {e}")
-        logger.error(f"📊 Analysis Summary:")
-        logger.error(f"   - Source ID: {args.source_id}")
-        logger.error(f"   - Command: {args.command}")
-        logger.error(f"   - Error: {str(e)}")
+        logger.error("❌ Command failed: %s", e)
+        logger.error("📊 Analysis Summary:")
+        logger.error("   - Source ID: %s", args.source_id)
+        logger.error("   - Command: %s", args.command)
+        logger.error("   - Error: %s", str(e))
         if log_level == 'DEBUG':
             import traceback
-            logger.debug(f"Full traceback:\n{traceback.format_exc()}")
+            logger.debug("Full traceback:\n%s", traceback.format_exc())
         
         # Update job status on error
         update_job_status(
@@ -0,0 +1,23 @@
+"""
+Tests for lib.json_utils.
+"""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from lib import json_utils
+
+
+def test_extract_json_text_keeps_backticks_inside_fenced_payload():
+    response = '```json\n{"a": "Exemplo:\\n```\\nlista\\n```", "b": 1}\n```'
+    assert json_utils.loads(json_utils.extract_json_text(response)) == {"a": "Exemplo:\n```\nlista\n```", "b": 1}
+
+
+def test_extract_json_text_unwraps_plain_fence():
+    assert json_utils.loads(json_utils.extract_json_text('```\n[1, 2]\n```')) == [1, 2]
+
+
+def test_extract_json_text_strips_surrounding_prose():
+    assert json_utils.loads(json_utils.extract_json_text('Here it is: {"a": 1} Done.')) == {"a": 1}
@@ -6,6 +6,8 @@ Test script to validate the Kritis V3.1 implementation.
 import os
 import sys
 import uuid
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from dotenv import load_dotenv
 
 # Add the project root to Python path
@@ -15,16 +17,23 @@ from lib.supabase_client import get_supabase_admin_client
 
 load_dotenv()
 
+@lru_cache(maxsize=None)
+def _fetch_reference_ids(table: str) -> tuple:
+    """Fetch the ids of a reference table once per run."""
+    return tuple(row['id'] for row in get_supabase_admin_client().table(table).select('id').execute().data)
+
+def _count_rows(table: str) -> int:
+    """Count a table's rows with a HEAD request, transferring no row data."""
+    return get_supabase_admin_client().table(table).select('id', count='exact', head=True).execute().count or 0
+
 def test_database_connection():
     """Test basic database connectivity."""
     print("🔍 Testing database connection...")
     
     try:
-        supabase = get_supabase_admin_client()
-        
         # Test basic connection by querying a simple table
-        response = supabase.table('law_version_statuses').select('id').limit(1).execute()
-        print(f"✅ Database connection successful. Found {len(response.data)} status records.")
+        statuses = _fetch_reference_ids('law_version_statuses')
+        print(f"✅ Database connection successful. Found {len(statuses)} status records.")
         return True
         
     except Exception as e:
@@ -47,16 +56,26 @@ def test_required_tables():
         'government_entities'
     ]
     
+    def probe(table):
+        try:
+            # HEAD request: the table is reachable without transferring any rows
+            supabase.table(table).select('*', head=True).execute()
+            return None
+        except Exception as e:
+            return e
+    
     try:
         supabase = get_supabase_admin_client()
         
-        for table in required_tables:
-            try:
-                response = supabase.table(table).select('*').limit(1).execute()
-                print(f"✅ Table '{table}' exists")
-            except Exception as e:
-                print(f"❌ Table '{table}' missing or inaccessible: {e}")
+        # Probe all tables concurrently, then report in a deterministic order
+        with ThreadPoolExecutor(max_workers=len(required_tables)) as executor:
+            errors = list(executor.map(probe, required_tables))
+        
+        for table, error in zip(required_tables, errors):
+            if error is not None:
+                print(f"❌ Table '{table}' missing or inaccessible: {error}")
                 return False
+            print(f"✅ Table '{table}' exists")
         
         print("✅ All required tables exist")
         return True
@@ -70,28 +89,26 @@ def test_reference_data():
     print("🔍 Testing reference data...")
     
     try:
-        supabase = get_supabase_admin_client()
-        
         # Check law version statuses
-        statuses = supabase.table('law_version_statuses').select('id').execute()
-        if 'ACTIVE' not in [s['id'] for s in statuses.data]:
+        statuses = _fetch_reference_ids('law_version_statuses')
+        if 'ACTIVE' not in statuses:
             print("❌ Required status 'ACTIVE' not found")
             return False
-        print(f"✅ Found {len(statuses.data)} law version statuses including 'ACTIVE'")
+        print(f"✅ Found {len(statuses)} law version statuses including 'ACTIVE'")
         
         # Check government entities
-        entities = supabase.table('government_entities').select('id').limit(1).execute()
-        if not entities.data:
+        entity_count = _count_rows('government_entities')
+        if not entity_count:
             print("⚠️ No government entities found - will need to create test data")
         else:
-            print(f"✅ Found {len(entities.data)} government entities")
+            print(f"✅ Found {entity_count} government entities")
         
         # Check mandates
-        mandates = supabase.table('mandates').select('id').limit(1).execute()
-        if not mandates.data:
+        mandate_count = _count_rows('mandates')
+        if not mandate_count:
             print("⚠️ No mandates found - will need to create test data")
         else:
-            print(f"✅ Found {len(mandates.data)} mandates")
+            print(f"✅ Found {mandate_count} mandates")
         
         return True
         
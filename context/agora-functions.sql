@@ -18,6 +18,12 @@
 -- 16. get_filtered_laws_list
 -- 18. handle_job_completion_notification
 -- 19. create_new_job
+-- 20. ingest_law
+-- 21. bulk_upsert_tags_and_links
+-- 22. create_law_with_articles
+-- 23. set_updated_at
+-- 24. verify_law_stats
+-- 25. verify_law_rows
 
 CREATE OR REPLACE FUNCTION agora.get_source_entities_with_details()
 RETURNS TABLE (
@@ -1449,4 +1455,273 @@ BEGIN
 END;
 $$ LANGUAGE plpgsql SECURITY DEFINER;
 
-COMMENT ON FUNCTION agora.delete_source_cascade(uuid) IS 'V2: Safely deletes a source and its pipeline data, only if it has no chunks or laws. Uses correct exception syntax.';
\ No newline at end of file
+COMMENT ON FUNCTION agora.delete_source_cascade(uuid) IS 'V2: Safely deletes a source and its pipeline data, only if it has no chunks or laws. Uses correct exception syntax.';
+-- ====================================================================
+-- SCRIPT: CREATE "INGEST LAW" FUNCTION (KRITIS V3.1 STAGE 3)
+-- Purpose: Performs the whole Stage 3 ingestion in one transaction:
+--          reads the latest extraction and analysis for a source,
+--          creates the parent law, inserts the preamble/article rows
+--          and aggregates their tags onto the law.
+-- NOTE:    'law_article_versions' has been renamed to 'law_articles'.
+-- ====================================================================
+
+CREATE OR REPLACE FUNCTION agora.ingest_law(
+    p_source_id uuid,
+    p_mandate_id uuid,
+    p_model_version text DEFAULT 'kritis_v31_enhanced_analyst'
+)
+RETURNS uuid AS $$
+DECLARE
+    v_extracted_data jsonb;
+    v_analysis_data jsonb;
+    v_metadata jsonb;
+    v_slug text;
+    v_law_id uuid;
+BEGIN
+    -- Step 1: Load the latest extraction and analysis payloads.
+    SELECT extracted_data INTO v_extracted_data
+    FROM agora.pending_extractions
+    WHERE source_id = p_source_id
+    ORDER BY created_at DESC
+    LIMIT 1;
+
+    IF v_extracted_data IS NULL THEN
+        RAISE EXCEPTION '%', format('No extraction data found for source %s', p_source_id);
+    END IF;
+
+    SELECT analysis_data INTO v_analysis_data
+    FROM agora.source_ai_analysis
+    WHERE source_id = p_source_id AND model_version = p_model_version
+    ORDER BY created_at DESC
+    LIMIT 1;
+
+    IF v_analysis_data IS NULL THEN
+        RAISE EXCEPTION '%', format('No analysis data found for source %s', p_source_id);
+    END IF;
+
+    v_metadata := COALESCE(v_extracted_data->'metadata', '{}'::jsonb);
+
+    -- Step 2: Create the parent law record (same slug rules as the Python path).
+    v_slug := left(replace(lower(COALESCE(v_metadata->>'official_title', v_metadata->>'official_number', '')), ' ', '-'), 100);
+    v_slug := regexp_replace(v_slug, '[^a-z0-9\-]', '', 'g');
+    IF v_slug = '' THEN
+        v_slug := 'law-' || left(replace(gen_random_uuid()::text, '-', ''), 8);
+    END IF;
+
+    INSERT INTO agora.laws (government_entity_id, source_id, official_title, slug, official_number, type_id, enactment_date)
+    VALUES (
+        COALESCE((v_metadata->>'government_entity_id')::uuid, '3ee8d3ef-7226-4bf3-8ea2-6e2e036d203f'::uuid),
+        p_source_id,
+        COALESCE(v_metadata->>'official_title', 'Untitled Law'),
+        v_slug,
+        v_metadata->>'official_number',
+        v_metadata->>'law_type_id',
+        (v_metadata->>'enactment_date')::date
+    )
+    RETURNING id INTO v_law_id;
+
+    -- Step 3: Insert the preamble (article_order = 0) and every article in one statement.
+    INSERT INTO agora.law_articles (law_id, article_order, mandate_id, status_id, valid_from, official_text, tags, translations)
+    SELECT
+        v_law_id,
+        items.article_order,
+        p_mandate_id,
+        'ACTIVE',
+        current_date,
+        items.official_text,
+        COALESCE(results.analysis->'tags', '[]'::jsonb),
+        COALESCE(results.analysis->'analysis', '{}'::jsonb)
+    FROM (
+        SELECT 0 AS article_order, v_extracted_data->>'preamble_text' AS official_text
+        WHERE btrim(COALESCE(v_extracted_data->>'preamble_text', '')) <> ''
+        UNION ALL
+        SELECT article.ordinality::int, article.value->>'official_text'
+        FROM jsonb_array_elements(COALESCE(v_extracted_data->'articles', '[]'::jsonb)) WITH ORDINALITY AS article(value, ordinality)
+    ) AS items
+    LEFT JOIN LATERAL (
+        SELECT r->'analysis' AS analysis
+        FROM jsonb_array_elements(COALESCE(v_analysis_data->'analysis_results', '[]'::jsonb)) AS r
+        WHERE COALESCE((r->>'article_order')::int, 0) = items.article_order
+        LIMIT 1
+    ) AS results ON true;
+
+    -- Step 4: Aggregate the distinct tags onto the parent law.
+    UPDATE agora.laws
+    SET tags = (
+        SELECT COALESCE(jsonb_agg(DISTINCT tag), '[]'::jsonb)
+        FROM agora.law_articles la,
+             jsonb_array_elements(COALESCE(la.tags, '[]'::jsonb)) AS tag
+        WHERE la.law_id = v_law_id
+    )
+    WHERE id = v_law_id;
+
+    RETURN v_law_id;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION agora.ingest_law(uuid, uuid, text) IS 'Creates a law, its preamble/article rows and aggregated tags from the latest pipeline data for a source in a single transaction.';
+-- ====================================================================
+-- SCRIPT: CREATE "BULK UPSERT TAGS AND LINKS" FUNCTION (KRITIS V4 STAGE 3)
+-- Purpose: Replaces the per-entity select/update/insert round-trips of
+--          the V4 intelligent tagging with one call per law: upserts
+--          every entity tag by name, then links the tags to their
+--          article versions, skipping links that already exist.
+-- ====================================================================
+
+CREATE OR REPLACE FUNCTION agora.bulk_upsert_tags_and_links(
+    p_entities jsonb,
+    p_links jsonb
+)
+RETURNS integer AS $$
+DECLARE
+    v_links_created integer;
+BEGIN
+    -- Step 1: Refresh the type of tags that already exist.
+    UPDATE agora.tags t
+    SET type = e.type
+    FROM jsonb_to_recordset(COALESCE(p_entities, '[]'::jsonb)) AS e(name text, type text)
+    WHERE t.name = e.name;
+
+    -- Step 2: Create the missing tags.
+    INSERT INTO agora.tags (name, type, translations)
+    SELECT e.name, e.type, jsonb_build_object('pt', jsonb_build_object('name', e.name), 'en', jsonb_build_object('name', e.name))
+    FROM jsonb_to_recordset(COALESCE(p_entities, '[]'::jsonb)) AS e(name text, type text)
+    WHERE NOT EXISTS (SELECT 1 FROM agora.tags t WHERE t.name = e.name);
+
+    -- Step 3: Link tags to article versions in one statement.
+    INSERT INTO agora.law_article_version_tags (version_id, tag_id)
+    SELECT DISTINCT l.version_id, t.id
+    FROM jsonb_to_recordset(COALESCE(p_links, '[]'::jsonb)) AS l(version_id uuid, name text)
+    JOIN agora.tags t ON t.name = l.name
+    WHERE NOT EXISTS (
+        SELECT 1 FROM agora.law_article_version_tags lt
+        WHERE lt.version_id = l.version_id AND lt.tag_id = t.id
+    );
+
+    GET DIAGNOSTICS v_links_created = ROW_COUNT;
+    RETURN v_links_created;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION agora.bulk_upsert_tags_and_links(jsonb, jsonb) IS 'Upserts entity tags by name and links them to article versions in a single call. Returns the number of links created.';
+-- ====================================================================
+-- SCRIPT: CREATE "CREATE LAW WITH ARTICLES" FUNCTION (KRITIS V4 STAGE 3)
+-- Purpose: Creates a law, its articles and their versions in a single
+--          transaction (one round-trip, no half-created laws). Article
+--          IDs are generated up front so each version is tied to its
+--          article without relying on RETURNING order.
+-- ====================================================================
+
+CREATE OR REPLACE FUNCTION agora.create_law_with_articles(
+    law_row jsonb,
+    articles jsonb
+)
+RETURNS jsonb AS $$
+DECLARE
+    v_law_id uuid;
+    v_articles jsonb;
+BEGIN
+    -- Step 1: Create the parent law record.
+    INSERT INTO agora.laws (government_entity_id, official_number, official_title, slug, type_id, enactment_date, translations)
+    VALUES (
+        (law_row->>'government_entity_id')::uuid,
+        law_row->>'official_number',
+        law_row->>'official_title',
+        law_row->>'slug',
+        law_row->>'type_id',
+        (law_row->>'enactment_date')::date,
+        NULLIF(law_row->'translations', 'null'::jsonb)
+    )
+    RETURNING id INTO v_law_id;
+
+    -- Step 2: Insert all articles and their versions in one statement.
+    WITH payload AS (
+        SELECT gen_random_uuid() AS article_id, a.value AS item, a.ordinality AS ord
+        FROM jsonb_array_elements(COALESCE(articles, '[]'::jsonb)) WITH ORDINALITY AS a(value, ordinality)
+    ),
+    ins_articles AS (
+        INSERT INTO agora.law_articles (id, law_id, article_number)
+        SELECT article_id, v_law_id, item->>'article_number'
+        FROM payload
+        RETURNING id
+    ),
+    ins_versions AS (
+        INSERT INTO agora.law_article_versions (article_id, mandate_id, status_id, valid_from, official_text, translations)
+        SELECT
+            p.article_id,
+            (p.item->>'mandate_id')::uuid,
+            COALESCE(p.item->>'status_id', 'ACTIVE'),
+            (p.item->>'valid_from')::date,
+            p.item->>'official_text',
+            NULLIF(p.item->'translations', 'null'::jsonb)
+        FROM payload p
+        JOIN ins_articles ia ON ia.id = p.article_id
+        RETURNING id, article_id
+    )
+    SELECT COALESCE(jsonb_agg(jsonb_build_object('article_id', p.article_id, 'version_id', iv.id) ORDER BY p.ord), '[]'::jsonb)
+    INTO v_articles
+    FROM payload p
+    JOIN ins_versions iv ON iv.article_id = p.article_id;
+
+    RETURN jsonb_build_object('law_id', v_law_id, 'articles', v_articles);
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+COMMENT ON FUNCTION agora.create_law_with_articles(jsonb, jsonb) IS 'Creates a law with its articles and article versions in one transaction. Returns the law id and the article/version ids in payload order.';
+
+-- Keeps updated_at current on every update, so clients do not send their own timestamp.
+CREATE OR REPLACE FUNCTION agora.set_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    NEW.updated_at := now();
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS on_job_updated_set_updated_at ON agora.background_jobs;
+CREATE TRIGGER on_job_updated_set_updated_at
+    BEFORE UPDATE ON agora.background_jobs
+    FOR EACH ROW
+    EXECUTE FUNCTION agora.set_updated_at();
+
+-- Article counts used by verify_law.py, aggregated server-side instead of shipping every row.
+CREATE OR REPLACE FUNCTION agora.verify_law_stats(p_law_id uuid)
+RETURNS TABLE (
+    total_count integer,
+    preamble_count integer,
+    article_count integer,
+    with_tags integer,
+    with_translations integer
+) AS $$
+    SELECT
+        count(*)::integer,
+        count(*) FILTER (WHERE article_order = 0)::integer,
+        count(*) FILTER (WHERE article_order <> 0)::integer,
+        count(*) FILTER (WHERE tags IS NOT NULL AND tags <> '[]'::jsonb AND tags <> '{}'::jsonb)::integer,
+        count(*) FILTER (WHERE translations IS NOT NULL AND translations <> '{}'::jsonb)::integer
+    FROM agora.law_articles
+    WHERE law_id = p_law_id;
+$$ LANGUAGE sql STABLE;
+
+CREATE OR REPLACE FUNCTION agora.verify_law_rows(p_law_id uuid, p_offset integer DEFAULT 0, p_limit integer DEFAULT 200)
+RETURNS TABLE (
+    article_order integer,
+    preview text,
+    tag_count integer,
+    has_translations boolean
+) AS $$
+    SELECT
+        la.article_order,
+        left(la.official_text, 120),
+        CASE jsonb_typeof(la.tags)
+            WHEN 'array' THEN jsonb_array_length(la.tags)
+            WHEN 'object' THEN (SELECT count(*)::integer FROM jsonb_object_keys(la.tags))
+            ELSE 0
+        END,
+        la.translations IS NOT NULL AND la.translations <> '{}'::jsonb
+    FROM agora.law_articles la
+    WHERE la.law_id = p_law_id
+    ORDER BY la.article_order
+    OFFSET p_offset
+    LIMIT p_limit;
+$$ LANGUAGE sql STABLE;
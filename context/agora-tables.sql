@@ -845,4 +845,17 @@ CREATE TABLE agora.votes (
   created_at timestamp with time zone DEFAULT now(),
   CONSTRAINT votes_pkey PRIMARY KEY (id),
   CONSTRAINT votes_user_id_fkey FOREIGN KEY (user_id) REFERENCES public.user_profiles(id)
-);
\ No newline at end of file
+);
+
+-- ====================================================================
+-- PIPELINE STAGING INDEXES
+-- Every Kritis stage reads the latest extraction/analysis of a source
+-- (ORDER BY created_at DESC LIMIT 1); these make that an index seek.
+-- ====================================================================
+CREATE INDEX IF NOT EXISTS idx_pending_extractions_source_latest ON agora.pending_extractions(source_id, created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_source_ai_analysis_source_model_latest ON agora.source_ai_analysis(source_id, model_version, created_at DESC);
+
+-- Cross-reference linking matches laws by official_number ILIKE '%n%';
+-- a trigram index keeps those leading-wildcard lookups off a sequential scan.
+CREATE EXTENSION IF NOT EXISTS pg_trgm;
+CREATE INDEX IF NOT EXISTS idx_laws_official_number_trgm ON agora.laws USING gin (official_number gin_trgm_ops);